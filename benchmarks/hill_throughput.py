@@ -0,0 +1,71 @@
+"""
+Hill cipher throughput benchmark.
+
+Compares the batched engine in ciphers/hill.py (one matmul + one mod over
+the whole message) against the original per-pair loop on 1 MB, 10 MB and
+100 MB inputs.
+
+Usage:
+    python benchmarks/hill_throughput.py
+    python benchmarks/hill_throughput.py --sizes 1 10 --legacy-max 10
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ciphers.hill import generate_key, hill_transform
+
+MB = 1024 * 1024
+
+
+def legacy_transform(text, key):
+    # The pre-batching implementation: one 1x2 array and one matmul per pair.
+    result = []
+    for i in range(0, len(text), 2):
+        pair = np.array([[text[i], text[i+1]]])
+        out = np.matmul(pair, key) % 26
+        result.append(out[0][0].item())
+        result.append(out[0][1].item())
+    return result
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hill cipher throughput benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100],
+                        help="Input sizes in MB (default: 1 10 100)")
+    parser.add_argument("--key", default="HILL", help="Hill key (default: HILL)")
+    parser.add_argument("--legacy-max", type=int, default=1,
+                        help="Largest size in MB to run the per-pair loop on (default: 1)")
+    args = parser.parse_args()
+
+    key = generate_key(args.key)
+    rng = np.random.default_rng(0)
+
+    print(f"{'size':>8} {'batched MB/s':>14} {'legacy MB/s':>13} {'speedup':>9}")
+    for size in args.sizes:
+        text = rng.integers(0, 26, size * MB, dtype=np.uint8)
+
+        batched = time_call(hill_transform, text, key)
+        batched_rate = size / batched
+
+        if size <= args.legacy_max:
+            legacy = time_call(legacy_transform, text.tolist(), key)
+            legacy_rate = size / legacy
+            print(f"{size:>6}MB {batched_rate:>14.1f} {legacy_rate:>13.2f} {legacy / batched:>8.0f}x")
+        else:
+            print(f"{size:>6}MB {batched_rate:>14.1f} {'-':>13} {'-':>9}")
+
+
+if __name__ == "__main__":
+    main()
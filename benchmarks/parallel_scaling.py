@@ -0,0 +1,68 @@
+"""
+Parallel encryption scaling benchmark.
+
+Runs ciphers/parallel.py on the same input with 1, 2, 4, ... worker
+processes (up to the core count) and reports throughput and speedup
+relative to a single worker.
+
+Usage:
+    python benchmarks/parallel_scaling.py
+    python benchmarks/parallel_scaling.py --cipher hill --key GYBNQKURP --size 50
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ciphers.keys import parse_key
+from ciphers.parallel import parallel_encrypt
+
+MB = 1024 * 1024
+
+
+def worker_counts(limit):
+    counts = []
+    n = 1
+    while n < limit:
+        counts.append(n)
+        n *= 2
+    counts.append(limit)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel encryption scaling benchmark")
+    parser.add_argument("--cipher", default="affine", choices=["caesar", "affine", "hill"])
+    parser.add_argument("--key", default=None, help="Key (shift, 'a,b' or key string)")
+    parser.add_argument("--size", type=int, default=100, help="Input size in MB (default: 100)")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    default_keys = {'caesar': '3', 'affine': '5,8', 'hill': 'HILL'}
+    key = parse_key(args.cipher, args.key or default_keys[args.cipher])
+
+    letters = np.frombuffer(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz', dtype=np.uint8)
+    rng = np.random.default_rng(0)
+    text = rng.choice(letters, args.size * MB).tobytes().decode('ascii')
+
+    print(f"{args.cipher}, {args.size} MB")
+    print(f"{'workers':>8} {'seconds':>9} {'MB/s':>9} {'speedup':>9}")
+    base = None
+    for workers in worker_counts(args.max_workers):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Warm the pool so process start-up is not part of the timing
+            list(executor.map(abs, range(workers)))
+            start = time.perf_counter()
+            parallel_encrypt(text, args.cipher, key, workers=workers, executor=executor)
+            elapsed = time.perf_counter() - start
+        base = base or elapsed
+        print(f"{workers:>8} {elapsed:>9.2f} {args.size / elapsed:>9.1f} {base / elapsed:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
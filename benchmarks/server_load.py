@@ -0,0 +1,128 @@
+"""
+Load generator for the cipher service (ciphers/server.py).
+
+Opens a number of connections, sends encrypt requests as fast as the
+server answers them, and reports requests/sec and client-side p50/p99
+latency, followed by the server's own statistics.
+
+Usage:
+    python benchmarks/server_load.py --spawn
+    python benchmarks/server_load.py --port 8765 --connections 32 --requests 50000
+    python benchmarks/server_load.py --spawn --cipher hill --key GYBNQKURP --size 1024
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import string
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ciphers.keys import parse_key
+from ciphers.server import DEFAULT_PORT
+
+
+async def connect(args):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+
+async def wait_for_server(args, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await connect(args)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+async def client(args, request, count, latencies):
+    reader, writer = await connect(args)
+    line = json.dumps(request).encode('utf-8') + b'\n'
+    for _ in range(count):
+        start = time.perf_counter()
+        writer.write(line)
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        if not response.get('ok'):
+            raise RuntimeError(response.get('error'))
+    writer.close()
+
+
+async def fetch_stats(args):
+    reader, writer = await connect(args)
+    writer.write(b'{"op": "stats"}\n')
+    await writer.drain()
+    stats = json.loads(await reader.readline())['result']
+    writer.close()
+    return stats
+
+
+async def run(args):
+    default_keys = {'caesar': '3', 'affine': '5,8', 'playfair': 'PLAYFAIR', 'hill': 'HILL'}
+    key = parse_key(args.cipher, args.key or default_keys[args.cipher])
+    text = ''.join(random.choice(string.ascii_letters) for _ in range(args.size))
+    request = {'op': 'encrypt', 'cipher': args.cipher, 'key': key, 'text': text}
+
+    await wait_for_server(args)
+
+    per_client = args.requests // args.connections
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args, request, per_client, latencies) for _ in range(args.connections)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"{args.cipher} encrypt, {args.size}-character messages, {args.connections} connections")
+    print(f"  requests:   {total}")
+    print(f"  throughput: {total / elapsed:,.0f} req/s")
+    print(f"  p50:        {latencies[total // 2] * 1000:.3f} ms")
+    print(f"  p99:        {latencies[min(total - 1, int(total * 0.99))] * 1000:.3f} ms")
+
+    stats = await fetch_stats(args)
+    server_latency = stats['latency'].get('encrypt', {})
+    print(f"  server p50: {server_latency.get('p50_ms', 0):.3f} ms, p99: {server_latency.get('p99_ms', 0):.3f} ms")
+    print(f"  key cache:  {stats['key_cache']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cipher service load generator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="Connect to a Unix socket instead of TCP")
+    parser.add_argument("--spawn", action="store_true", help="Start a server process for the run")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--cipher", default="affine", choices=["caesar", "affine", "playfair", "hill"])
+    parser.add_argument("--key", default=None, help="Key (shift, 'a,b' or key string)")
+    parser.add_argument("--size", type=int, default=64, help="Message length in characters (default: 64)")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        command = [sys.executable, "-m", "ciphers.server", "--host", args.host, "--port", str(args.port)]
+        if args.unix:
+            command[3:] = ["--unix", args.unix]
+        server = subprocess.Popen(command, cwd=ROOT)
+    try:
+        asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Startup time benchmark for main.py (or the frozen PyInstaller binary).
+
+Measures the time from launch until main.py shows the menu, and until each
+cipher asks its first question once chosen. A bare interpreter start is
+timed as well, so the application's own share ("app ms") can be separated
+from Python's. Each case is also run once under python -X importtime to
+report whether NumPy was loaded and which imports cost the most.
+
+The target is at most 50 ms of application time to the first prompt of
+every non-Hill cipher; the run exits with status 1 when it is missed.
+With --command the binary is timed as a whole, with no interpreter
+baseline to subtract and no import breakdown.
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --runs 30 --top 15
+    python benchmarks/startup.py --command dist/pycipher
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "main.py")
+
+TARGET_MS = 50.0
+
+# name, console input for a complete session, first prompt after the menu
+# choice, whether the target applies. Hill decrypts so no bank.txt entry
+# is written.
+CASES = [
+    ('menu', b"0\n", b"Enter your choice", True),
+    ('caesar', b"1\nE\nhello\n3\n", b"Enter the plaintext", True),
+    ('affine', b"2\nE\nhello\n5\n8\n", b"Enter the plaintext", True),
+    ('playfair', b"3\nE\nhello\nKEY\n", b"Enter the plaintext", True),
+    ('hill', b"4\nD\nABCD\nHILL\n", b"Enter the ciphertext", False),
+]
+
+
+def time_to_prompt(command, session, marker):
+    """
+    Seconds from launch until marker appears on the program's stdout.
+    """
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    start = time.perf_counter()
+    proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, cwd=ROOT, env=env)
+    try:
+        proc.stdin.write(session)
+        proc.stdin.flush()
+        seen = b''
+        while marker not in seen:
+            chunk = os.read(proc.stdout.fileno(), 65536)
+            if not chunk:
+                raise RuntimeError(f"{' '.join(command)} exited before printing {marker!r}")
+            seen += chunk
+        return time.perf_counter() - start
+    finally:
+        proc.kill()
+        proc.wait()
+        proc.stdin.close()
+        proc.stdout.close()
+
+
+def median_ms(command, session, marker, runs):
+    return statistics.median(time_to_prompt(command, session, marker) for _ in range(runs)) * 1000
+
+
+def import_times(python, session):
+    """
+    Run one session under -X importtime. Returns {module: (self us,
+    cumulative us, depth)} in import order.
+    """
+    proc = subprocess.run([python, "-X", "importtime", MAIN], input=session, cwd=ROOT,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    modules = {}
+    for line in proc.stderr.decode('utf-8', 'replace').splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        modules[name.strip()] = (int(own), int(cumulative), depth)
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PyCipher startup time benchmark")
+    parser.add_argument("--runs", type=int, default=15, help="Launches per case (default: 15)")
+    parser.add_argument("--python", default=sys.executable, help="Interpreter to run main.py with")
+    parser.add_argument("--command", nargs="+", default=None,
+                        help="Time this command instead of python main.py, e.g. dist/pycipher")
+    parser.add_argument("--top", type=int, default=10, help="Heaviest imports to list per case (default: 10)")
+    parser.add_argument("--target", type=float, default=TARGET_MS,
+                        help=f"Allowed app ms to first prompt for non-Hill ciphers (default: {TARGET_MS:g})")
+    args = parser.parse_args()
+
+    command = args.command or [args.python, MAIN]
+    baseline = 0.0
+    if args.command is None:
+        baseline = median_ms([args.python, "-c", "print('ready')"], b'', b'ready', args.runs)
+        print(f"{'interpreter':<12} {baseline:>9.1f} ms")
+
+    print(f"{'case':<12} {'median':>12} {'app':>9} {'numpy':>7}")
+    missed = []
+    breakdowns = {}
+    for name, session, marker, gated in CASES:
+        total = median_ms(command, session, marker, args.runs)
+        app = total - baseline
+
+        numpy = '-'
+        if args.command is None:
+            breakdowns[name] = import_times(args.python, session)
+            numpy = 'yes' if 'numpy' in breakdowns[name] else 'no'
+
+        flag = ''
+        if gated and app > args.target:
+            missed.append(name)
+            flag = f"  > {args.target:g} ms"
+        print(f"{name:<12} {total:>9.1f} ms {app:>6.1f} ms {numpy:>7}{flag}", flush=True)
+
+    for name, modules in breakdowns.items() if args.top else ():
+        heaviest = sorted(((cumulative, module) for module, (_, cumulative, depth) in modules.items()
+                           if depth == 0), reverse=True)[:args.top]
+        print(f"\nHeaviest top-level imports, {name}:")
+        for cumulative, module in heaviest:
+            print(f"  {cumulative / 1000:>8.1f} ms  {module}")
+
+    if missed:
+        print(f"\nOver the {args.target:g} ms target: {', '.join(missed)}")
+        return 1
+    print(f"\nEvery non-Hill cipher reaches its first prompt within {args.target:g} ms of app time.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+Benchmark suite with stored baselines and regression gating.
+
+Times encryption and decryption for every cipher, the Hill known-plaintext
+attack, key setup and text normalization over input sizes from 16 bytes up
+to 100 MB, and reports ops/sec, MB/s and peak memory for each case.
+
+Results can be saved as JSON and a later run compared against them; the
+run fails (exit status 1) when any case's throughput drops by more than
+--threshold.
+
+Usage:
+    python benchmarks/suite.py
+    python benchmarks/suite.py --max-size 100M --save benchmarks/baseline.json
+    python benchmarks/suite.py --baseline benchmarks/baseline.json --threshold 0.25
+    python benchmarks/suite.py --only hill
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ciphers import affine, alphabet, ceaser, hill, playfair
+from ciphers.hill_attack import attack_hill
+
+SIZES = [16, 1024, 64 * 1024, 1024 * 1024, 16 * 1024 * 1024, 100 * 1024 * 1024]
+UNITS = {'K': 1024, 'M': 1024 * 1024}
+
+# Cases whose cost does not depend on input size
+FIXED_SIZE = 0
+
+HILL_KEY = "GYBNQKURP"
+PLAYFAIR_KEY = "PLAYFAIR EXAMPLE"
+AFFINE_KEY = (5, 8)
+CAESAR_KEY = 3
+
+
+def parse_size(text):
+    text = text.upper()
+    if text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def make_text(size, seed=0):
+    """
+    Mixed-case letters with spaces and light punctuation, size bytes long.
+    """
+    rng = random.Random(seed)
+    unit = ''.join(rng.choice(string.ascii_letters + "  .,") for _ in range(min(size, 64 * 1024)))
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def cases(size):
+    """
+    Yield (name, setup) pairs. setup() prepares inputs outside the timing
+    and returns the zero-argument callable to time.
+    """
+    def text():
+        return make_text(size)
+
+    def hill_plain():
+        return hill.hill_word_mapper(text(), 'w2n', pad=True, block=3)
+
+    def to_indices():
+        t = text()
+        return lambda: alphabet.to_indices(t)
+
+    def from_indices():
+        indices = alphabet.to_indices(text())
+        return lambda: alphabet.from_indices(indices)
+
+    def caesar_encrypt():
+        t = text()
+        return lambda: ceaser.calculate_cipher(t, CAESAR_KEY)
+
+    def caesar_decrypt():
+        cipher = ceaser.calculate_cipher(text(), CAESAR_KEY)
+        return lambda: ceaser.retrieve_plaintext(cipher, CAESAR_KEY)
+
+    def affine_encrypt():
+        t = text()
+        return lambda: affine.affine_encrypt(t, *AFFINE_KEY)
+
+    def affine_decrypt():
+        cipher = affine.affine_encrypt(text(), *AFFINE_KEY)
+        return lambda: affine.affine_decrypt(cipher, *AFFINE_KEY)
+
+    def playfair_encrypt():
+        t = text()
+        return lambda: playfair.encrypt(t, PLAYFAIR_KEY, details=False)
+
+    def playfair_decrypt():
+        cipher = playfair.encrypt(text(), PLAYFAIR_KEY, details=False)
+        return lambda: playfair.decrypt(cipher, PLAYFAIR_KEY, details=False)
+
+    def hill_encrypt():
+        plain = hill_plain()
+        return lambda: hill.generate_ciphertext(plain, HILL_KEY)
+
+    def hill_decrypt():
+        cipher = hill.hill_word_mapper(hill.generate_ciphertext(hill_plain(), HILL_KEY), 'w2n')
+        return lambda: hill.hill_retrieve_plaintext(cipher, HILL_KEY)
+
+    def hill_attack():
+        plain = hill_plain()
+        cipher = hill.generate_ciphertext(plain, HILL_KEY)
+        return lambda: attack_hill(alphabet.from_indices(plain), cipher)
+
+    yield 'normalize/to_indices', to_indices
+    yield 'normalize/from_indices', from_indices
+    yield 'caesar/encrypt', caesar_encrypt
+    yield 'caesar/decrypt', caesar_decrypt
+    yield 'affine/encrypt', affine_encrypt
+    yield 'affine/decrypt', affine_decrypt
+    yield 'playfair/encrypt', playfair_encrypt
+    yield 'playfair/decrypt', playfair_decrypt
+    yield 'hill/encrypt', hill_encrypt
+    yield 'hill/decrypt', hill_decrypt
+    if size <= 64 * 1024:
+        yield 'hill/attack', hill_attack
+
+
+def key_cases():
+    """
+    Key setup for every cipher, bypassing the key caches.
+    """
+    def caesar_key():
+        return lambda: ceaser.shift_table.__wrapped__(CAESAR_KEY)
+
+    def affine_key():
+        return lambda: affine.build_table.__wrapped__(*AFFINE_KEY, decrypt=True)
+
+    def playfair_key():
+        return lambda: playfair.generate_playfair_table.__wrapped__(PLAYFAIR_KEY)
+
+    def hill_key():
+        return lambda: hill.key_schedule.__wrapped__(HILL_KEY)
+
+    yield 'keys/caesar', caesar_key
+    yield 'keys/affine', affine_key
+    yield 'keys/playfair', playfair_key
+    yield 'keys/hill', hill_key
+
+
+def measure(func, min_time, rounds=5):
+    """
+    Best-of-rounds seconds per call, with enough calls per round to run
+    for at least min_time.
+    """
+    start = time.perf_counter()
+    func()
+    once = time.perf_counter() - start
+
+    calls = max(1, int(min_time / max(once, 1e-9)))
+    best = once
+    for _ in range(rounds if once < min_time else 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best
+
+
+def peak_memory(func):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(name, size, setup, min_time):
+    func = setup()
+    seconds = measure(func, min_time)
+    result = {
+        'name': name,
+        'size': size,
+        'seconds': seconds,
+        'ops_per_s': 1 / seconds,
+        'peak_bytes': peak_memory(func),
+    }
+    if size:
+        result['mb_per_s'] = size / seconds / (1024 * 1024)
+    return result
+
+
+def case_id(result):
+    return f"{result['name']}@{result['size']}"
+
+
+def run_suite(sizes, only, min_time):
+    results = []
+    plans = [(name, FIXED_SIZE, setup) for name, setup in key_cases()]
+    for size in sizes:
+        plans.extend((name, size, setup) for name, setup in cases(size))
+
+    for name, size, setup in plans:
+        if only and not any(part in name for part in only):
+            continue
+        result = run_case(name, size, setup, min_time)
+        results.append(result)
+        report(result)
+    return results
+
+
+def report(result):
+    rate = f"{result['mb_per_s']:>10.2f} MB/s" if 'mb_per_s' in result else f"{'':>15}"
+    print(f"{result['name']:<24} {result['size']:>11} {result['ops_per_s']:>14,.1f} ops/s {rate} "
+          f"{result['peak_bytes'] / (1024 * 1024):>9.2f} MB peak", flush=True)
+
+
+def compare(results, baseline, threshold):
+    """
+    Return a list of messages for cases slower than the baseline by more
+    than threshold (a fraction).
+    """
+    previous = {case_id(r): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        before = previous.get(case_id(result))
+        if before is None:
+            continue
+        change = result['ops_per_s'] / before['ops_per_s'] - 1
+        if change < -threshold:
+            regressions.append(f"{case_id(result)}: {before['ops_per_s']:,.1f} -> "
+                               f"{result['ops_per_s']:,.1f} ops/s ({change:+.0%})")
+    return regressions
+
+
+def metadata():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PyCipher benchmark suite")
+    parser.add_argument("--max-size", default="1M", help="Largest input size, e.g. 64K, 16M, 100M (default: 1M)")
+    parser.add_argument("--only", nargs="+", default=None, help="Run only cases whose name contains one of these")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timing round (default: 0.2)")
+    parser.add_argument("--save", default=None, help="Write results to this JSON file")
+    parser.add_argument("--baseline", default=None, help="Compare against this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.3,
+                        help="Allowed throughput drop before a case counts as regressed (default: 0.3)")
+    args = parser.parse_args()
+
+    max_size = parse_size(args.max_size)
+    sizes = [size for size in SIZES if size <= max_size]
+
+    print(f"{'case':<24} {'bytes':>11} {'throughput':>20} {'':>15} {'peak memory':>17}")
+    results = run_suite(sizes, args.only, args.min_time)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'meta': metadata(), 'results': results}, f, indent=2)
+        print(f"\nSaved {len(results)} results to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%} against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,7 +9,15 @@ where:
 - a must be coprime with 26 (gcd(a, 26) = 1)
 - b is any integer (0-25)
 - a^(-1) is the modular multiplicative inverse of a mod 26
+
+Each (a, b) key is compiled once into a cached 256-entry translation table,
+so encryption and decryption are a single translate() over the whole text.
+Only the ASCII letters A-Z and a-z are treated as alphabet characters.
 """
+from functools import lru_cache
+
+from ciphers import alphabet, metrics, modular
+from ciphers.alphabet import LETTER_BYTES, NON_LETTERS, as_indices
 
 def gcd(a, b):
     """
@@ -26,11 +34,10 @@ def mod_inverse(a, m=26):
     Returns x such that (a*x) % m = 1
     This is needed for decryption.
     """
-    a = a % m
-    for x in range(1, m):
-        if (a * x) % m == 1:
-            return x
-    return None  # No inverse exists
+    try:
+        return modular.mod_inverse(a, m)
+    except ValueError:
+        return None  # No inverse exists
 
 def validate_key(a, b):
     """
@@ -43,6 +50,64 @@ def validate_key(a, b):
         raise ValueError(f"Key 'b'={b} is not valid. 'b' must be between 0 and 25.")
     return True
 
+class _LettersOnly(dict):
+    """
+    str.translate mapping that deletes every character without an entry.
+    """
+    def __missing__(self, key):
+        return None
+
+
+@lru_cache(maxsize=128)
+def build_table(a, b, decrypt=False):
+    """
+    Compile a key into a 256-entry byte substitution table.
+    
+    Letters are mapped through the encryption (or decryption) formula with
+    their case preserved; every other byte maps to itself.
+    """
+    # Validate the key first
+    validate_key(a, b)
+    
+    if decrypt:
+        # Find modular inverse of 'a' mod 26
+        a_inv = mod_inverse(a, 26)
+        if a_inv is None:
+            raise ValueError(f"No modular inverse exists for a={a} mod 26")
+    
+    table = bytearray(range(256))
+    for x in range(26):
+        if decrypt:
+            # D(y) = a^(-1)*(y - b) mod 26
+            y = (a_inv * (x - b)) % 26
+        else:
+            # E(x) = (a*x + b) mod 26
+            y = (a * x + b) % 26
+        table[ord('A') + x] = ord('A') + y
+        table[ord('a') + x] = ord('a') + y
+    return bytes(table)
+
+
+@lru_cache(maxsize=128)
+def _str_table(table, include_non_alpha):
+    mapping = {c: chr(table[c]) for c in LETTER_BYTES}
+    return mapping if include_non_alpha else _LettersOnly(mapping)
+
+
+def translate_text(text, table, include_non_alpha=False):
+    """
+    Run text through a compiled table in a single translate() call.
+    Non-letters are kept when include_non_alpha is True and dropped otherwise.
+    """
+    if text.isascii():
+        data = text.encode('ascii')
+        if include_non_alpha:
+            return data.translate(table).decode('ascii')
+        return data.translate(table, NON_LETTERS).decode('ascii')
+    
+    return text.translate(_str_table(table, include_non_alpha))
+
+
 def affine_encrypt(text, a, b, include_non_alpha=False):
     """
     Encrypt text using Affine Cipher.
@@ -55,39 +120,13 @@ def affine_encrypt(text, a, b, include_non_alpha=False):
     
     Returns: Encrypted string
     """
-    # Validate the key first
-    validate_key(a, b)
-    
-    encrypted_text = []
-    
-    for char in text:
-        if char.isalpha():
-            # Convert to uppercase for consistency
-            char_upper = char.upper()
-            
-            # Get character's position (A=0, B=1, ..., Z=25)
-            x = ord(char_upper) - ord('A')
-            
-            # Apply Affine Cipher encryption formula: E(x) = (a*x + b) mod 26
-            encrypted_x = (a * x + b) % 26
-            
-            # Convert back to character
-            encrypted_char = chr(encrypted_x + ord('A'))
-            
-            # Preserve original case
-            if char.islower():
-                encrypted_char = encrypted_char.lower()
-            
-            encrypted_text.append(encrypted_char)
-        else:
-            # Handle non-alphabetic characters
-            if include_non_alpha:
-                encrypted_text.append(char)
-            else:
-                # Skip or handle as needed
-                encrypted_text.append('')
-    
-    return ''.join(encrypted_text)
+    probe = metrics.start('affine', 'encrypt', len(text))
+    table = build_table(a, b)
+    probe.mark('key_setup')
+
+    encrypted = translate_text(text, table, include_non_alpha)
+    probe.mark('transform')
+    return encrypted
 
 def affine_decrypt(cipher_text, a, b, include_non_alpha=False):
     """
@@ -101,45 +140,69 @@ def affine_decrypt(cipher_text, a, b, include_non_alpha=False):
     
     Returns: Decrypted string
     """
-    # Validate the key first
-    validate_key(a, b)
-    
-    # Find modular inverse of 'a' mod 26
-    a_inv = mod_inverse(a, 26)
-    if a_inv is None:
-        raise ValueError(f"No modular inverse exists for a={a} mod 26")
-    
-    decrypted_text = []
-    
-    for char in cipher_text:
-        if char.isalpha():
-            # Convert to uppercase for consistency
-            char_upper = char.upper()
-            
-            # Get character's position (A=0, B=1, ..., Z=25)
-            y = ord(char_upper) - ord('A')
-            
-            # Apply Affine Cipher decryption formula: D(y) = a^(-1)*(y - b) mod 26
-            # Note: In Python, (y - b) % 26 handles negative numbers correctly
-            decrypted_x = (a_inv * (y - b)) % 26
-            
-            # Convert back to character
-            decrypted_char = chr(decrypted_x + ord('A'))
-            
-            # Preserve original case
-            if char.islower():
-                decrypted_char = decrypted_char.lower()
-            
-            decrypted_text.append(decrypted_char)
-        else:
-            # Handle non-alphabetic characters
-            if include_non_alpha:
-                decrypted_text.append(char)
-            else:
-                # Skip or handle as needed
-                decrypted_text.append('')
+    probe = metrics.start('affine', 'decrypt', len(cipher_text))
+    table = build_table(a, b, decrypt=True)
+    probe.mark('key_setup')
+
+    decrypted = translate_text(cipher_text, table, include_non_alpha)
+    probe.mark('transform')
+    return decrypted
+
+@lru_cache(maxsize=128)
+def index_table(a, b, decrypt=False):
+    """
+    The key as a 26-entry uint8 lookup over letter positions (0-25).
+    """
+    import numpy as np
+
+    table = np.frombuffer(build_table(a, b, decrypt), dtype=np.uint8)
+    table = table[ord('A'):ord('Z') + 1] - ord('A')
+    table.flags.writeable = False
+    return table
+
+def encrypt_indices(indices, a, b):
+    """
+    Encrypt letter positions (0-25); returns a new uint8 array.
+    """
+    return index_table(a, b)[as_indices(indices)]
+
+def decrypt_indices(indices, a, b):
+    """
+    Decrypt letter positions (0-25); returns a new uint8 array.
+    """
+    return index_table(a, b, decrypt=True)[as_indices(indices)]
+
+def translate_batch(messages, table, include_non_alpha=False):
+    """
+    Run many messages through a compiled table in one vectorized pass over
+    a single packed buffer.
+    """
+    import numpy as np
+    from ciphers.packing import compact, pack, unpack
+
+    try:
+        buffer, offsets = pack(messages)
+    except UnicodeEncodeError:
+        return [translate_text(m, table, include_non_alpha) for m in messages]
     
-    return ''.join(decrypted_text)
+    if not include_non_alpha:
+        buffer, offsets = compact(buffer, offsets, alphabet.LETTER_MASK)
+    lut = np.frombuffer(table, dtype=np.uint8)
+    return unpack(lut[buffer], offsets)
+
+def encrypt_batch(messages, a, b, include_non_alpha=False):
+    """
+    Encrypt a list of messages with one (a, b) key.
+    The key is validated and compiled once for the whole batch.
+    """
+    return translate_batch(messages, build_table(a, b), include_non_alpha)
+
+def decrypt_batch(messages, a, b, include_non_alpha=False):
+    """
+    Decrypt a list of messages with one (a, b) key.
+    The key is validated and compiled once for the whole batch.
+    """
+    return translate_batch(messages, build_table(a, b, decrypt=True), include_non_alpha)
 
 def get_valid_a_values():
     """
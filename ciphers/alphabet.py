@@ -0,0 +1,123 @@
+"""
+TEXT NORMALIZATION
+==================
+Shared conversions between text and the A-Z alphabet for every cipher.
+All translation tables are built once at import, so converting a string is
+a single bytes.translate() plus np.frombuffer() for ASCII text:
+
+    to_indices("Hello, World")     # array([ 7,  4, 11, 11, 14, 22, ...], dtype=uint8)
+    from_indices([7, 4, 11, 11])   # 'HELL'
+    normalize("Hello, World")      # 'HELLOWORLD'
+
+The integer-level cipher APIs (encrypt_indices/decrypt_indices in each
+cipher module) take and return these uint8 arrays, so chained ciphers
+stay in the integer domain and convert to text only at the edges.
+
+Letter positions are A=0 ... Z=25 for both cases. Non-ASCII text is
+upper-cased first, so characters such as the long s that upper-case to
+ASCII letters are accepted like the old per-character mappers did.
+
+Importing this module does not import NumPy: the byte tables are plain
+bytes, LETTER_MASK and INDEX_LOOKUP are built on first access, and the
+array conversions import NumPy when they run.
+"""
+UPPERCASE = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+LETTER_BYTES = UPPERCASE + UPPERCASE.lower()
+NON_LETTERS = bytes(c for c in range(256) if c not in LETTER_BYTES)
+
+# Characters the word mappers silently drop
+PUNCTUATION = b".,?!$%^&*;:}{[]-_`~()@#\\|<>\n\t "
+DIGITS = b"0123456789"
+
+# Byte -> letter position for both cases, 26 for anything that is not a letter
+_TO_INDEX = bytes(LETTER_BYTES.index(c) % 26 if c in LETTER_BYTES else 26 for c in range(256))
+_TO_UPPER = bytes(range(256)).translate(bytes.maketrans(UPPERCASE.lower(), UPPERCASE))
+_TO_LETTER = UPPERCASE + bytes(230)
+_POSITIONS = bytes(range(26))
+
+
+def _letter_mask():
+    from ciphers.packing import byte_mask
+    return byte_mask(LETTER_BYTES)
+
+
+def _index_lookup():
+    import numpy as np
+    return np.frombuffer(_TO_INDEX, dtype=np.uint8)
+
+
+# Read-only NumPy tables, built on first access as module attributes
+_ARRAYS = {
+    'LETTER_MASK': _letter_mask,
+    'INDEX_LOOKUP': _index_lookup,
+}
+
+
+def __getattr__(name):
+    factory = _ARRAYS.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = factory()
+    return value
+
+
+def _unsupported(text, deleted):
+    """
+    Raise KeyError for the first character that is neither a letter nor in
+    deleted, as the old dictionary-based mappers did.
+    """
+    for ch in text:
+        if not (ch.isascii() and ch.isalpha()) and ch.encode('utf-8') not in deleted:
+            raise KeyError(ch)
+    raise KeyError(text)
+
+
+def to_indices(text, deleted=PUNCTUATION):
+    """
+    Convert text to a uint8 array of letter positions, dropping every
+    character in deleted. Raises KeyError for any other non-letter.
+    """
+    import numpy as np
+
+    if not text.isascii():
+        text = text.upper()
+        if not text.isascii():
+            _unsupported(text, deleted)
+
+    data = text.encode('ascii').translate(_TO_INDEX, deleted)
+    if data.translate(None, _POSITIONS):
+        _unsupported(text, deleted)
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def as_indices(data):
+    """
+    View letter positions as a uint8 array. bytes, bytearray and memoryview
+    inputs are wrapped without copying.
+    """
+    import numpy as np
+
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return np.frombuffer(data, dtype=np.uint8)
+    return np.asarray(data, dtype=np.uint8)
+
+
+def from_indices(indices):
+    """
+    Convert letter positions (0-25) back into an uppercase string.
+    """
+    import numpy as np
+
+    data = np.asarray(indices, dtype=np.uint8).tobytes()
+    if data.translate(None, _POSITIONS):
+        raise KeyError(int(next(x for x in data if x > 25)))
+    return data.translate(_TO_LETTER).decode('ascii')
+
+
+def normalize(text):
+    """
+    Upper-case text and keep only its letters.
+    """
+    if text.isascii():
+        return text.encode('ascii').translate(_TO_UPPER, NON_LETTERS).decode('ascii')
+    return ''.join(filter(str.isalpha, text.upper()))
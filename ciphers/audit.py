@@ -0,0 +1,134 @@
+"""
+AUDIT SINKS
+===========
+Hill encryption can report every (plaintext, key, ciphertext) it produces
+to an audit sink. The default sink does nothing, so encryption never
+touches the filesystem unless a sink is installed:
+
+    sink = QueuedFileAuditSink("hill/bank.txt")
+    set_audit_sink(sink)
+    ...
+    sink.close()
+
+Every Hill encryption path records one entry per call: generate_ciphertext,
+encrypt_indices and HillKey, one per message for the batch APIs, one per
+chunk for streams, and one per call for the parallel driver, recorded in
+the calling process once the shards are joined. Pipelines are the
+exception; see ciphers.pipeline.
+
+QueuedFileAuditSink hands entries to a background thread through a queue.
+The thread appends them to the file in batches, flushing when batch_size
+entries are pending or flush_interval seconds have passed since the first
+pending entry, so encryption latency is decoupled from disk I/O.
+"""
+import queue
+import sys
+import threading
+import time
+
+from ciphers import metrics
+
+
+class AuditSink:
+    """
+    No-op sink. Subclasses override record() (and close() if they hold
+    resources). enabled lets callers skip building entries nobody reads.
+    """
+    enabled = False
+
+    def record(self, plaintext, key, ciphertext):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class QueuedFileAuditSink(AuditSink):
+    """
+    Appends entries to a file from a background thread.
+    """
+    enabled = True
+
+    _STOP = object()
+
+    def __init__(self, path, batch_size=256, flush_interval=1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+        self.thread.start()
+
+    def record(self, plaintext, key, ciphertext):
+        self.queue.put(f"\nPlaintext: {plaintext} \n Key: {key}\n Ciphertext: {ciphertext}\n")
+
+    def flush(self):
+        """
+        Block until every entry recorded so far has been written.
+        """
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait()
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(self._STOP)
+            self.thread.join()
+
+    def _write(self, entries):
+        text = ''.join(entries)
+        probe = metrics.start('hill', nbytes=len(text))
+        try:
+            with open(self.path, "a") as f:
+                f.write(text)
+        except OSError as e:
+            print(f"Audit sink could not write to {self.path}: {e}", file=sys.stderr)
+        probe.mark('bank_write')
+
+    def _run(self):
+        pending = []
+        deadline = None
+
+        while True:
+            timeout = None if not pending else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, str):
+                if not pending:
+                    deadline = time.monotonic() + self.flush_interval
+                pending.append(item)
+                if len(pending) < self.batch_size and time.monotonic() < deadline:
+                    continue
+
+            if pending:
+                self._write(pending)
+                pending = []
+
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is self._STOP:
+                return
+
+
+_sink = AuditSink()
+
+
+def get_audit_sink():
+    return _sink
+
+
+def set_audit_sink(sink):
+    """
+    Install a sink and return the previous one. Pass None to restore the
+    no-op default.
+    """
+    global _sink
+    previous = _sink
+    _sink = sink if sink is not None else AuditSink()
+    return previous
@@ -0,0 +1,22 @@
+"""
+BATCH ENCRYPTION
+================
+Encrypt or decrypt thousands of short messages (database fields, queue
+payloads) in one call. The key is validated and compiled once, and for
+Caesar, Affine and Hill the records are packed into a single buffer and
+processed in one vectorized pass.
+
+    encrypt_batch(["alice", "bob"], "affine", (5, 8))
+
+Keys take the forms described in ciphers.keys. Extra keyword options
+(such as include_non_alpha for Affine) are passed through.
+"""
+from ciphers.keys import compile_key
+
+
+def encrypt_batch(messages, cipher, key, **options):
+    return compile_key(cipher, key).encrypt_batch(list(messages), **options)
+
+
+def decrypt_batch(messages, cipher, key, **options):
+    return compile_key(cipher, key).decrypt_batch(list(messages), **options)
@@ -0,0 +1,147 @@
+"""
+BULK FILE MODE
+==============
+Memory-mapped file encryption for the substitution ciphers (Caesar and
+Affine). The input file is mapped, viewed as a NumPy uint8 array and run
+through the cipher's 256-entry lookup table window by window, writing
+straight into a memory-mapped output file. No Python strings are created,
+so throughput is bound by disk bandwidth rather than the interpreter.
+
+    encrypt_file("logs.txt", "logs.enc", "affine", (5, 8), include_non_alpha=True)
+    decrypt_file("logs.enc", None, "affine", (5, 8), include_non_alpha=True)  # in place
+
+An output path naming the input file is treated as in place too, never as
+a fresh output that would truncate the file while it is still being read.
+
+Files are treated as bytes: only the ASCII letters are substituted, and any
+other byte (including UTF-8 multi-byte sequences) is kept or dropped as a
+non-letter, matching affine_encrypt/calculate_cipher on the decoded text.
+Caesar drops the same punctuation and whitespace as calculate_cipher and
+rejects files containing other characters (digits, non-ASCII).
+"""
+import os
+
+import numpy as np
+
+from ciphers import affine, alphabet, ceaser
+
+DEFAULT_WINDOW = 64 * 1024 * 1024
+
+
+def _plan(cipher, key, decrypt, include_non_alpha, in_place=False):
+    """
+    Return (lookup table, keep mask or None, allowed mask or None) for a key.
+    """
+    if cipher == 'caesar':
+        if in_place:
+            raise ValueError("Caesar cannot run in place: it drops punctuation and whitespace, "
+                             "so the output is shorter than the file. Pass an output path.")
+        table = ceaser.shift_table(-key if decrypt else key)
+        return np.frombuffer(table, dtype=np.uint8), alphabet.LETTER_MASK, ceaser.allowed_mask()
+
+    if cipher == 'affine':
+        if in_place and not include_non_alpha:
+            raise ValueError("Affine runs in place only with include_non_alpha=True, "
+                             "which keeps the file length unchanged.")
+        a, b = key
+        table = affine.build_table(a, b, decrypt=decrypt)
+        keep = None if include_non_alpha else alphabet.LETTER_MASK
+        return np.frombuffer(table, dtype=np.uint8), keep, None
+
+    raise ValueError(f"Bulk file mode supports 'caesar' and 'affine', not '{cipher}'.")
+
+
+def _windows(size, window):
+    for start in range(0, size, window):
+        yield start, min(start + window, size)
+
+
+def _check_allowed(src, allowed, window):
+    for start, stop in _windows(len(src), window):
+        bad = np.flatnonzero(~allowed[src[start:stop]])
+        if bad.size:
+            offset = start + int(bad[0])
+            raise ValueError(f"Unsupported byte {src[offset]:#04x} at offset {offset}.")
+
+
+def _map(path, mode, size=None):
+    if size is None:
+        size = os.path.getsize(path)
+    if size == 0:
+        if mode == 'w+':
+            open(path, 'wb').close()
+        return np.zeros(0, dtype=np.uint8)
+    return np.memmap(path, dtype=np.uint8, mode=mode, shape=(size,))
+
+
+def _in_place(src_path, dst_path):
+    """
+    True for dst_path=None or a path naming the same file as src_path.
+    """
+    return dst_path is None or (os.path.exists(dst_path) and os.path.samefile(src_path, dst_path))
+
+
+def transform_file(src_path, dst_path, lut, keep=None, allowed=None, window=DEFAULT_WINDOW):
+    """
+    Map every byte of src_path through lut into dst_path.
+
+    keep is an optional 256-entry boolean mask of bytes to retain (others
+    are dropped); allowed is an optional mask of bytes that may appear at
+    all. dst_path=None, or the path of src_path itself, transforms src_path
+    in place, which is only possible when no bytes are dropped. Returns the
+    number of bytes written.
+    """
+    if _in_place(src_path, dst_path):
+        if keep is not None:
+            raise ValueError("In-place mode requires a length-preserving transform (keep=None).")
+        data = _map(src_path, 'r+')
+        if allowed is not None:
+            _check_allowed(data, allowed, window)
+        for start, stop in _windows(len(data), window):
+            view = data[start:stop]
+            np.take(lut, view, out=view)
+        if isinstance(data, np.memmap):
+            data.flush()
+        return len(data)
+
+    src = _map(src_path, 'r')
+    if allowed is not None:
+        _check_allowed(src, allowed, window)
+
+    if keep is None:
+        counts = None
+        size = len(src)
+    else:
+        counts = [int(np.count_nonzero(keep[src[start:stop]])) for start, stop in _windows(len(src), window)]
+        size = sum(counts)
+
+    dst = _map(dst_path, 'w+', size)
+    pos = 0
+    for i, (start, stop) in enumerate(_windows(len(src), window)):
+        view = src[start:stop]
+        if counts is None:
+            np.take(lut, view, out=dst[start:stop])
+        else:
+            dst[pos:pos + counts[i]] = lut[view[keep[view]]]
+            pos += counts[i]
+    if isinstance(dst, np.memmap):
+        dst.flush()
+    return size
+
+
+def encrypt_file(src_path, dst_path, cipher, key, include_non_alpha=False, window=DEFAULT_WINDOW):
+    """
+    Encrypt a file with Caesar (key=shift) or Affine (key=(a, b)).
+    Pass dst_path=None to encrypt in place (Affine with include_non_alpha=True).
+    """
+    lut, keep, allowed = _plan(cipher, key, False, include_non_alpha, _in_place(src_path, dst_path))
+    return transform_file(src_path, dst_path, lut, keep, allowed, window)
+
+
+def decrypt_file(src_path, dst_path, cipher, key, include_non_alpha=False, window=DEFAULT_WINDOW):
+    """
+    Decrypt a file with Caesar (key=shift) or Affine (key=(a, b)).
+    Pass dst_path=None to decrypt in place (Affine with include_non_alpha=True).
+    """
+    lut, keep, allowed = _plan(cipher, key, True, include_non_alpha, _in_place(src_path, dst_path))
+    return transform_file(src_path, dst_path, lut, keep, allowed, window)
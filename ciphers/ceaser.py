@@ -1,50 +1,118 @@
+from functools import lru_cache
 
-def word_mapper(text,mode):
-    chars= {'A':0, 'B':1, 'C':2, 'D':3, 'E':4, 'F':5, 'G':6, 'H':7, 'I':8, 'J':9, 'K':10, 'L':11, 'M':12,
-            'N':13, 'O':14, 'P':15, 'Q':16, 'R':17, 'S':18, 'T':19, 'U':20, 'V':21, 'W':22, 'X':23, 'Y':24, 'Z':25}
-
-    if mode=='w2n':
-        mapped_text=[]
-        special_chars=".,?!$%^&*;:}{[]-_`~()@#\\|<>\n\t"
+from ciphers import metrics
+from ciphers.alphabet import LETTER_BYTES, PUNCTUATION, as_indices, from_indices, to_indices
 
-        text= text.translate(str.maketrans('', '', special_chars))
-        text = text.replace(" ", "").upper()
-        
-        for ch in text:
-            mapped_text.append(chars[ch])
 
-        return mapped_text
+def word_mapper(text,mode):
+    if mode=='w2n':
+        return to_indices(text, DELETED_CHARS)
     
     elif mode=='n2w':
-        reverse_chars = {v: k for k, v in chars.items()}
-        return [reverse_chars[n] for n in text]
+        return list(from_indices(text))
     
 
-def calculate_cipher(plaintext, shift=3):
-    plaintext= word_mapper(plaintext,"w2n")
-    ciphertext= []
+DELETED_CHARS = PUNCTUATION
 
-    for i in range(0,len(plaintext)):
-        cipher_char= (plaintext[i] + shift) % 26
-        ciphertext.append(cipher_char)
 
-    ciphertext= word_mapper(ciphertext, 'n2w')    
-    
-    final_cipher = "".join(ciphertext)
-    return final_cipher
+@lru_cache(maxsize=None)
+def allowed_mask():
+    """
+    256-entry boolean mask of the bytes a message may contain: letters and
+    the deleted characters. Built on first use so import stays NumPy-free.
+    """
+    from ciphers.packing import byte_mask
+    return byte_mask(LETTER_BYTES, DELETED_CHARS)
+
+
+@lru_cache(maxsize=64)
+def shift_table(shift):
+    """
+    Compile a shift into a 256-entry byte table for bytes.translate.
+    Upper and lower case letters both map to the shifted uppercase letter.
+    """
+    table = bytearray(range(256))
+    for i in range(26):
+        shifted = ord('A') + (i + shift) % 26
+        table[ord('A') + i] = shifted
+        table[ord('a') + i] = shifted
+    return bytes(table)
+
+
+def translate_text(text, table):
+    """
+    Run text through a compiled shift table, dropping the deleted characters.
+    """
+    if not text.isascii():
+        text = text.upper()
+
+    if text.isascii():
+        shifted = text.encode('ascii').translate(table, DELETED_CHARS)
+        if not shifted or shifted.isalpha():
+            return shifted.decode('ascii')
+
+    # Unsupported character left over: fail the same way the mapper does
+    to_indices(text, DELETED_CHARS)
+    raise ValueError("Unsupported character in text")
+
+
+def shift_text(text, shift, op=None):
+    probe = metrics.start('caesar', op, len(text))
+    table = shift_table(shift)
+    probe.mark('key_setup')
+
+    shifted = translate_text(text, table)
+    probe.mark('transform')
+    return shifted
+
+
+def calculate_cipher(plaintext, shift=3):
+    return shift_text(plaintext, shift, 'encrypt')
 
 
 def retrieve_plaintext(ciphertext,shift=3):
-    ciphertext= word_mapper(ciphertext,"w2n")
-    plaintext=[]
+    return shift_text(ciphertext, -shift, 'decrypt')
 
-    for i in range(0, len(ciphertext)):
-        plain_char = (ciphertext[i] - shift) % 26
-        plaintext.append(plain_char)
-    
-    plaintext= word_mapper(plaintext, 'n2w')
-    final_plain = "".join(plaintext)
-    return final_plain
+
+def shift_indices(indices, shift):
+    """
+    Shift letter positions (0-25) and return a new uint8 array.
+    """
+    return (as_indices(indices) + shift % 26) % 26
+
+
+def encrypt_indices(indices, shift=3):
+    return shift_indices(indices, shift)
+
+
+def decrypt_indices(indices, shift=3):
+    return shift_indices(indices, -shift)
+
+
+def shift_batch(messages, shift):
+    """
+    Shift many messages at once: the records are packed into one buffer,
+    filtered and run through the shift table in a single vectorized pass.
+    """
+    import numpy as np
+    from ciphers.packing import pack_letters, unpack
+
+    packed = pack_letters(messages, allowed_mask())
+    if packed is None:
+        # Let the per-message path raise for the offending character
+        return [shift_text(m, shift) for m in messages]
+
+    buffer, offsets = packed
+    lut = np.frombuffer(shift_table(shift), dtype=np.uint8)
+    return unpack(lut[buffer], offsets)
+
+
+def encrypt_batch(messages, shift=3):
+    return shift_batch(messages, shift)
+
+
+def decrypt_batch(messages, shift=3):
+    return shift_batch(messages, -shift)
 
 
 
@@ -0,0 +1,89 @@
+"""
+ENGLISH LETTER STATISTICS
+=========================
+Reference letter and bigram frequencies for scoring candidate plaintexts
+in the cryptanalysis routines. All scoring functions work on integer
+arrays of letter positions (A=0 ... Z=25), as produced by the word mappers,
+and score many candidates at once: pass a 2-D array with one candidate
+per row.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+# Relative frequency (%) of each letter A-Z in English text
+LETTER_FREQUENCIES = np.array([
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153,
+    0.772, 4.025, 2.406, 6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056,
+    2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+]) / 100
+
+# Frequency (%) of the most common English bigrams
+COMMON_BIGRAMS = {
+    'TH': 3.56, 'HE': 3.07, 'IN': 2.43, 'ER': 2.05, 'AN': 1.99, 'RE': 1.85,
+    'ON': 1.76, 'AT': 1.49, 'EN': 1.45, 'ND': 1.35, 'TI': 1.34, 'ES': 1.34,
+    'OR': 1.28, 'TE': 1.20, 'OF': 1.17, 'ED': 1.17, 'IS': 1.13, 'IT': 1.12,
+    'AL': 1.09, 'AR': 1.07, 'ST': 1.05, 'TO': 1.04, 'NT': 1.04, 'NG': 0.95,
+    'SE': 0.93, 'HA': 0.93, 'AS': 0.87, 'OU': 0.87, 'IO': 0.83, 'LE': 0.83,
+    'VE': 0.83, 'CO': 0.79, 'ME': 0.79, 'DE': 0.76, 'HI': 0.76, 'RI': 0.73,
+    'RO': 0.73, 'IC': 0.70, 'NE': 0.69, 'EA': 0.69, 'RA': 0.69, 'CE': 0.65,
+    'LI': 0.62, 'CH': 0.60, 'LL': 0.58, 'BE': 0.58, 'MA': 0.57, 'SI': 0.55,
+    'OM': 0.55, 'UR': 0.54,
+}
+
+
+def _bigram_log_probabilities():
+    # Letter-independence model, with the common bigrams set to their
+    # observed frequencies, then renormalized
+    probs = np.outer(LETTER_FREQUENCIES, LETTER_FREQUENCIES)
+    for bigram, freq in COMMON_BIGRAMS.items():
+        probs[ord(bigram[0]) - 65, ord(bigram[1]) - 65] = freq / 100
+    probs /= probs.sum()
+    return np.log10(probs)
+
+
+LETTER_LOG_PROBABILITIES = np.log10(LETTER_FREQUENCIES)
+BIGRAM_LOG_PROBABILITIES = _bigram_log_probabilities()
+
+
+@lru_cache(maxsize=1)
+def quadgram_log_probabilities():
+    """
+    Flat 26^4 table of log10 quadgram probabilities, index
+    a*17576 + b*676 + c*26 + d, derived from the bigram model as a
+    first-order Markov chain: P(abcd) = P(ab) P(c|b) P(d|c).
+    """
+    bigrams = BIGRAM_LOG_PROBABILITIES
+    conditional = bigrams - np.log10((10 ** bigrams).sum(axis=1))[:, None]
+    table = (bigrams[:, :, None, None]
+             + conditional[None, :, :, None]
+             + conditional[None, None, :, :])
+    table = table.astype(np.float32).ravel()
+    table.flags.writeable = False
+    return table
+
+
+def letter_counts(indices):
+    """
+    Letter histogram of each row: (..., length) -> (..., 26).
+    """
+    indices = np.asarray(indices)
+    flat = indices.reshape(-1, indices.shape[-1])
+    offsets = (np.arange(len(flat)) * 26)[:, None]
+    counts = np.bincount((flat + offsets).ravel(), minlength=26 * len(flat))
+    return counts.reshape(indices.shape[:-1] + (26,))
+
+
+def unigram_score(indices):
+    """
+    Log10 likelihood of each row under English letter frequencies.
+    """
+    return letter_counts(indices) @ LETTER_LOG_PROBABILITIES
+
+
+def bigram_score(indices):
+    """
+    Log10 likelihood of each row under the English bigram model.
+    """
+    indices = np.asarray(indices)
+    return BIGRAM_LOG_PROBABILITIES[indices[..., :-1], indices[..., 1:]].sum(axis=-1)
@@ -0,0 +1,61 @@
+"""
+FREQUENCY ANALYSIS ATTACKS ON CAESAR AND AFFINE
+===============================================
+Both ciphers map each letter to a fixed letter, so a key's fitness depends
+only on the ciphertext letter histogram. The histogram is computed once
+with np.bincount; every key then decrypts the histogram rather than the
+text, by permuting the English log-frequency vector, so scoring all 26
+shifts (or all 312 affine keys) costs the same however long the text is.
+
+    crack_caesar(ciphertext, top_k=3)   # [(shift, score), ...]
+    crack_affine(ciphertext, top_k=3)   # [((a, b), score), ...]
+
+Scores are log10 likelihoods under English letter frequencies; higher is
+better, and candidates are returned best first.
+"""
+import numpy as np
+
+from ciphers.affine import get_valid_a_values
+from ciphers.alphabet import INDEX_LOOKUP
+from ciphers.english import LETTER_LOG_PROBABILITIES
+from ciphers.modular import vector_inverse
+
+
+def letter_histogram(text):
+    """
+    Count each letter A-Z (either case) in text in a single pass.
+    """
+    data = np.frombuffer(text.encode('ascii', 'ignore'), dtype=np.uint8)
+    return np.bincount(INDEX_LOOKUP[data], minlength=27)[:26]
+
+
+def _rank(keys, plain_letters, counts, top_k):
+    """
+    plain_letters[k, y] is the plaintext letter that ciphertext letter y
+    decrypts to under keys[k].
+    """
+    scores = LETTER_LOG_PROBABILITIES[plain_letters] @ counts
+    order = np.argsort(-scores, kind='stable')[:top_k]
+    return [(keys[i], float(scores[i])) for i in order]
+
+
+def crack_caesar(ciphertext, top_k=None):
+    """
+    Rank all 26 Caesar shifts for a ciphertext. Returns (shift, score) pairs.
+    """
+    counts = letter_histogram(ciphertext)
+    shifts = np.arange(26)
+    plain_letters = (np.arange(26)[None, :] - shifts[:, None]) % 26
+    return _rank(shifts.tolist(), plain_letters, counts, top_k)
+
+
+def crack_affine(ciphertext, top_k=None):
+    """
+    Rank all 312 Affine keys for a ciphertext. Returns ((a, b), score) pairs.
+    """
+    counts = letter_histogram(ciphertext)
+    keys = [(a, b) for a in get_valid_a_values() for b in range(26)]
+    a_inv = vector_inverse([a for a, _ in keys])
+    b = np.array([b for _, b in keys])
+    plain_letters = (a_inv[:, None] * (np.arange(26)[None, :] - b[:, None])) % 26
+    return _rank(keys, plain_letters, counts, top_k)
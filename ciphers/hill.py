@@ -1,5 +1,13 @@
 import numpy as np
 import math
+from functools import lru_cache
+
+from ciphers.alphabet import (DIGITS, INDEX_LOOKUP, LETTER_BYTES, PUNCTUATION, as_indices, from_indices,
+                              to_indices)
+from ciphers import metrics
+from ciphers.audit import get_audit_sink
+from ciphers.modular import mod_inverse
+from ciphers.packing import byte_mask, pack_letters, pad, unpack
 
 '''
 Hill Cipher Encryption
@@ -13,136 +21,244 @@ As the key is of 2x2 size, have to process the plaintext 2 letters at a time
 plaintext: Random text "Tomorrow is the date to execute the event"--> "TO MO RR OW IS TH ED AT ET OE XE CU TE TH EE VE NT"
 
 ciphertext: Plaintext x key -> C = []
+
+Larger keys work the same way: a key of n*n letters gives an n x n matrix
+and the plaintext is processed n letters at a time.
 '''
-def mod_inverse(a, m=26):
-    for x in range(1, m):
-        if (a * x) % m == 1:
-            return x
-    raise ValueError("No modular inverse exists")
+def matrix_mod_inverse(key, m=26):
+    """
+    Invert an n x n matrix modulo m with exact integer Gauss-Jordan elimination.
 
+    Works for composite moduli such as 26: before each pivot step the rows
+    below are folded into the pivot row with Euclid's algorithm, so the pivot
+    becomes the gcd of the column and is a unit whenever the matrix is
+    invertible.
+    """
+    n = len(key)
+    aug = [[int(x) % m for x in row] + [int(i == j) for j in range(n)] for i, row in enumerate(key)]
 
-def matrix_mod_inverse(key, m=26):
-    a, b = key[0]
-    c, d = key[1]
+    for col in range(n):
+        for row in range(col + 1, n):
+            while aug[row][col]:
+                q = aug[col][col] // aug[row][col]
+                aug[col] = [(x - q * y) % m for x, y in zip(aug[col], aug[row])]
+                aug[col], aug[row] = aug[row], aug[col]
 
-    det = (a*d - b*c) % m
+        pivot = aug[col][col]
+        if math.gcd(pivot, m) != 1:
+            raise ValueError(f"The key matrix is not invertible modulo {m}.")
 
-    det_inv = mod_inverse(det, m)
+        pivot_inv = mod_inverse(pivot, m)
+        aug[col] = [(x * pivot_inv) % m for x in aug[col]]
 
-    adj = np.array([[ d, -b],
-                    [-c,  a]])
+        for row in range(n):
+            factor = aug[row][col]
+            if row != col and factor:
+                aug[row] = [(x - factor * y) % m for x, y in zip(aug[row], aug[col])]
 
-    key_inv = (det_inv * adj) % m
-    return key_inv
+    return np.array([row[n:] for row in aug])
 
 
-def hill_word_mapper(text,mode, pad=False):
-    chars= {'A':0, 'B':1, 'C':2, 'D':3, 'E':4, 'F':5, 'G':6, 'H':7, 'I':8, 'J':9, 'K':10, 'L':11, 'M':12,
-            'N':13, 'O':14, 'P':15, 'Q':16, 'R':17, 'S':18, 'T':19, 'U':20, 'V':21, 'W':22, 'X':23, 'Y':24, 'Z':25}
+SPECIAL_CHARS = DIGITS + PUNCTUATION
+ALLOWED_MASK = byte_mask(LETTER_BYTES, SPECIAL_CHARS)
+PAD_INDEX = ord('X') - ord('A')
 
-    if mode=='w2n':
-        mapped_text=[]
-        special_chars="0123456789.,?!$%^&*;:}{[]-_`~()@#\\|<>\n\t"
 
-        text= text.translate(str.maketrans('', '', special_chars))
-        text = text.replace(" ", "").upper()
-        
-        if pad and len(text)%2!=0:
-            text+="X"
+def hill_word_mapper(text,mode, pad=False, block=2):
+    if mode=='w2n':
+        probe = metrics.start('hill', nbytes=len(text))
+        mapped_text = to_indices(text, SPECIAL_CHARS)
 
-        for ch in text:
-            mapped_text.append(chars[ch])
+        if pad and len(mapped_text)%block!=0:
+            padding = np.full(block - len(mapped_text)%block, PAD_INDEX, dtype=np.uint8)
+            mapped_text = np.concatenate([mapped_text, padding])
 
+        probe.mark('normalize')
         return mapped_text
     
     elif mode=='n2w':
-        reverse_chars = {v: k for k, v in chars.items()}
-        return [reverse_chars[n] for n in text]
+        return list(from_indices(text))
     
     else:
         raise ValueError("Invalid mode")
 
 
-def generate_key(key):
-    
-    key = hill_word_mapper(key, 'w2n', pad=False)
-    key = np.array(key).reshape(2,2)
+@lru_cache(maxsize=256)
+def key_schedule(key):
+    """
+    Parse and validate a key string once and cache the result.
 
-    det = int(np.round(np.linalg.det(key)))
+    Returns a (key_matrix, key_inverse) pair of read-only arrays. Repeated
+    calls with the same key string skip parsing, validation and inversion.
+    """
+    mapped = to_indices(key, SPECIAL_CHARS)
+    n = math.isqrt(len(mapped))
 
-    if math.gcd(det,26) != 1:
-        raise ValueError("The key matrix is not invertible. Please provide a valid key.")
-    else:
-        # print(f"Key ---> {key}")
-        return key
+    if n == 0 or n * n != len(mapped):
+        raise ValueError("The key length must be a perfect square (4, 9, 16, ... letters).")
 
+    key_matrix = mapped.astype(np.int64).reshape(n, n)
 
-def generate_ciphertext(plaintext, key):
-    
-    print_key = key
-    key  = generate_key(key)
+    try:
+        key_inv = matrix_mod_inverse(key_matrix)
+    except ValueError:
+        raise ValueError("The key matrix is not invertible. Please provide a valid key.") from None
 
-    ciphertext= []
-    
-    for i in range(0, len(plaintext), 2):
-        
-        pair = np.array([[plaintext[i], plaintext[i+1]]])
+    key_matrix.flags.writeable = False
+    key_inv.flags.writeable = False
+    return key_matrix, key_inv
 
-        # print(f"Pair matrix: {pair}")
 
-        cipher_pair = np.matmul(pair, key)%26
-        
-        # print(f"After multiplication: {cipher_pair}")
+def generate_key(key):
+    return key_schedule(key)[0]
 
-        ciphertext.append(cipher_pair[0][0].item())
-        ciphertext.append(cipher_pair[0][1].item())
 
+def hill_transform(text, key, m=26):
+    """
+    Run the whole mapped text through the key in one batch.
 
-    # print("Ciphertext matrix: ", ciphertext)
+    The text is viewed as an (N/n x n) block matrix, so every block is
+    multiplied by the key in a single matmul followed by a single mod.
+    """
+    n = key.shape[0]
+    blocks = np.asarray(text, dtype=np.int32)
 
-    ciphertext = hill_word_mapper(ciphertext, 'n2w', pad=False)
-    
-    final_cipher= "".join(ciphertext)
-    
-    plaintext = hill_word_mapper(plaintext, 'n2w', pad=False)
-    plaintext= "".join(plaintext)
+    if blocks.size % n != 0:
+        raise ValueError(f"Text length must be a multiple of {n}. Pad the text before processing.")
 
-    with open("hill/bank.txt", "a") as f:
-        f.write(f"\nPlaintext: {plaintext} \n Key: {print_key}\n Ciphertext: {final_cipher}\n")
+    blocks = blocks.reshape(-1, n)
+    result = np.matmul(blocks, key.astype(np.int32)) % m
 
-    return final_cipher
+    return result.reshape(-1)
 
 
-def hill_retrieve_plaintext(ciphertext, key):
+def hill_indices_to_text(indices):
+    """
+    Convert an array of 0-25 letter positions back into an uppercase string.
+    """
+    return from_indices(indices)
 
-    key = generate_key(key)
 
-    key_inv = matrix_mod_inverse(key)
+def generate_ciphertext(plaintext, key):
+    
+    probe = metrics.start('hill', 'encrypt', len(plaintext))
+    print_key = key
+    key  = generate_key(key)
+    probe.mark('key_setup')
 
-    plaintext=[]
+    ciphertext = hill_transform(plaintext, key)
+    probe.mark('transform')
 
-    for i in range(0, len(ciphertext), 2):
-        
-        pair = np.array([[ciphertext[i], ciphertext[i+1]]])
+    final_cipher = hill_indices_to_text(ciphertext)
 
-        # print(f"Pair matrix: {pair}")
+    sink = get_audit_sink()
+    if sink.enabled:
+        sink.record(hill_indices_to_text(plaintext), print_key, final_cipher)
+    probe.mark('output')
 
-        plain_pair = np.matmul(pair, key_inv)%26
-        
-        # print(f"After multiplication: {cipher_pair}")
+    return final_cipher
 
-        plaintext.append(int(round(plain_pair[0][0].item())))
-        plaintext.append(int(round(plain_pair[0][1].item())))
 
+def hill_retrieve_plaintext(ciphertext, key):
 
-    # print("Ciphertext matrix: ", ciphertext)
+    probe = metrics.start('hill', 'decrypt', len(ciphertext))
+    _, key_inv = key_schedule(key)
+    probe.mark('key_setup')
 
-    plaintext = hill_word_mapper(plaintext, 'n2w', pad=False)
+    plaintext = hill_transform(ciphertext, key_inv)
+    probe.mark('transform')
 
-    final_plain= "".join(plaintext)
+    final_plain = hill_indices_to_text(plaintext)
+    probe.mark('output')
 
     return final_plain
 
+def record_audit(plain, key, cipher):
+    """
+    Report an encryption to the audit sink, if one is installed. plain and
+    cipher are letter positions (0-25).
+    """
+    sink = get_audit_sink()
+    if sink.enabled:
+        sink.record(from_indices(plain), key, from_indices(cipher))
+
+
+def encrypt_indices(indices, key):
+    """
+    Encrypt letter positions (0-25), padding with X to a full block.
+    Returns a uint8 array.
+    """
+    key_matrix, _ = key_schedule(key)
+    n = key_matrix.shape[0]
+    plain = as_indices(indices)
+    if len(plain) % n:
+        plain = np.concatenate([plain, np.full(n - len(plain) % n, PAD_INDEX, dtype=np.uint8)])
+
+    cipher = hill_transform(plain, key_matrix).astype(np.uint8)
+    record_audit(plain, key, cipher)
+    return cipher
+
+
+def decrypt_indices(indices, key):
+    """
+    Decrypt letter positions (0-25). Returns a uint8 array.
+    """
+    _, key_inv = key_schedule(key)
+    return hill_transform(as_indices(indices), key_inv).astype(np.uint8)
+
+
+def _batch_indices(messages, block, pad_text):
+    """
+    Normalize many messages into one packed buffer of letter positions.
+    """
+    packed = pack_letters(messages, ALLOWED_MASK)
+    if packed is None:
+        # Let the mapper raise for the offending character
+        for m in messages:
+            to_indices(m, SPECIAL_CHARS)
+        raise ValueError("Unsupported character in text")
+
+    buffer, offsets = packed
+    buffer = INDEX_LOOKUP[buffer]
+
+    if pad_text:
+        buffer, offsets = pad(buffer, offsets, block, PAD_INDEX)
+    elif np.any(np.diff(offsets) % block):
+        raise ValueError(f"Every ciphertext length must be a multiple of {block}.")
+
+    return buffer, offsets
+
+
+def _transform_batch(messages, matrix, pad_text):
+    buffer, offsets = _batch_indices(messages, matrix.shape[0], pad_text)
+    result = hill_transform(buffer, matrix).astype(np.uint8)
+    return buffer, offsets, unpack(result + ord('A'), offsets)
+
+
+def encrypt_batch(messages, key):
+    """
+    Encrypt a list of plaintext strings with one key. Every message is
+    normalized and padded with X like main.py does, then all blocks of all
+    messages go through a single matmul.
+    """
+    key_matrix, _ = key_schedule(key)
+    buffer, offsets, ciphertexts = _transform_batch(messages, key_matrix, pad_text=True)
+
+    sink = get_audit_sink()
+    if sink.enabled:
+        for plaintext, ciphertext in zip(unpack(buffer + ord('A'), offsets), ciphertexts):
+            sink.record(plaintext, key, ciphertext)
+
+    return ciphertexts
+
+
+def decrypt_batch(messages, key):
+    """
+    Decrypt a list of ciphertext strings with one key in a single matmul.
+    """
+    _, key_inv = key_schedule(key)
+    return _transform_batch(messages, key_inv, pad_text=False)[2]
+
 
 
 # print("Hill Cipher Encryption")
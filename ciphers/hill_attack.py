@@ -1,81 +1,265 @@
 import numpy as np
-import math
+from functools import lru_cache
+from numpy.lib.stride_tricks import sliding_window_view
 
-def mod_inverse(a, m=26):
-    for x in range(1, m):
-        if (a * x) % m == 1:
-            return x
-    raise ValueError("No modular inverse exists")
+from ciphers.alphabet import from_indices, to_indices
+from ciphers.english import bigram_score, unigram_score
+from ciphers.hill import matrix_mod_inverse
+from ciphers.modular import inverse_2x2, inverse_table, is_unit, mod_inverse
 
+'''
+Known-plaintext attack on the Hill cipher
 
-def matrix_mod_inverse(key, m=26):
-    a, b = key[0]
-    c, d = key[1]
+With ciphertext blocks C = P x K, any n plaintext blocks that form an
+invertible n x n matrix P give the key directly: K = P^-1 x C.
 
-    det = (a*d - b*c) % m
+The whole crib is used, not just its first n*n letters:
+- every window of n consecutive blocks is checked for invertibility at once
+  (batched elimination mod 2 and mod 13, the prime factors of 26),
+- if no window is invertible, all blocks are combined in one modular
+  elimination, which succeeds whenever the crib determines the key,
+- the recovered key is verified against every complete block of the crib.
 
-    det_inv = mod_inverse(det, m)
+The crib is taken to start on a block boundary, as messages do. Key sizes
+2x2 up to MAX_KEY_SIZE are tried smallest first, unless key_size is given.
+An n x n key that only repeats a smaller key along its diagonal encrypts
+like that smaller key, so it must also fit the crib as the smaller key
+(whose blocks reach further into a crib that is not a multiple of n);
+otherwise the crib is inconsistent and no key is returned for it.
+'''
+MAX_KEY_SIZE = 8
 
-    adj = np.array([[ d, -b],
-                    [-c,  a]])
+'''
+Ciphertext-only search for 2x2 keys
 
-    key_inv = (det_inv * adj) % m
-    return key_inv
+Plaintext blocks are P = C x D with D = K^-1, so every candidate D can be
+tried directly. search_hill_keys scores candidate decryptions with English
+letter statistics:
+- "full" decrypts under all 157,248 invertible matrices as one batched
+  tensor matmul (in chunks) and ranks them with a bigram model,
+- "columns" uses the fact that column j of D alone produces the plaintext
+  letters at positions j, j+2, ...: the 676 possible columns are ranked by
+  letter frequency, and only pairs of the best columns are combined and
+  ranked with the bigram model (2 x 26^2 candidates instead of 26^4).
+'''
+SEARCH_CHUNK = 8192
 
-def word_mapper(text,mode):
-    chars= {'A':0, 'B':1, 'C':2, 'D':3, 'E':4, 'F':5, 'G':6, 'H':7, 'I':8, 'J':9, 'K':10, 'L':11, 'M':12,
-            'N':13, 'O':14, 'P':15, 'Q':16, 'R':17, 'S':18, 'T':19, 'U':20, 'V':21, 'W':22, 'X':23, 'Y':24, 'Z':25}
 
-    if mode=='w2n':
-        mapped_text=[]
-        special_chars=".,?!$%^&*;:}{[]-_`~()@#\\|<>\n\t"
+def batch_full_rank(matrices, p):
+    """
+    Check a stack of n x n matrices for full rank modulo a prime p.
+    Gaussian elimination runs on the whole (B, n, n) stack at once and a
+    boolean array of length B is returned.
+    """
+    a = np.array(matrices, dtype=np.int64) % p
+    count, n, _ = a.shape
+    inverses = inverse_table(p)
+    rows = np.arange(count)
+    full_rank = np.ones(count, dtype=bool)
 
-        text= text.translate(str.maketrans('', '', special_chars))
-        text = text.replace(" ", "").upper()
-        
-        for ch in text:
-            mapped_text.append(chars[ch])
+    for col in range(n):
+        nonzero = a[:, col:, col] != 0
+        full_rank &= nonzero.any(axis=1)
+        pivot = col + nonzero.argmax(axis=1)
 
-        return mapped_text
-    
-    elif mode=='n2w':
-        reverse_chars = {v: k for k, v in chars.items()}
-        return [reverse_chars[n] for n in text]
+        pivot_rows = a[rows, pivot].copy()
+        a[rows, pivot] = a[:, col]
+        a[:, col] = pivot_rows
+
+        a[:, col] = (a[:, col] * inverses[a[:, col, col]][:, None]) % p
+        factors = a[:, col+1:, col]
+        a[:, col+1:] = (a[:, col+1:] - factors[:, :, None] * a[:, None, col]) % p
+
+    return full_rank
+
+
+def solve_stacked(plain_blocks, cipher_blocks, m=26):
+    """
+    Solve plain_blocks x K = cipher_blocks (mod m) using every block at once.
+
+    Lower rows are folded into each pivot row with Euclid's algorithm, as in
+    matrix_mod_inverse, so blocks that are individually useless can still
+    combine into a unit pivot. Returns None if the blocks do not determine K.
+    """
+    n = plain_blocks.shape[1]
+    aug = [[int(x) for x in row] for row in np.hstack([plain_blocks, cipher_blocks]) % m]
+
+    for col in range(n):
+        for row in range(col + 1, len(aug)):
+            while aug[row][col]:
+                q = aug[col][col] // aug[row][col]
+                aug[col] = [(x - q * y) % m for x, y in zip(aug[col], aug[row])]
+                aug[col], aug[row] = aug[row], aug[col]
+
+        pivot = aug[col][col]
+        try:
+            pivot_inv = mod_inverse(pivot, m)
+        except ValueError:
+            return None
+        aug[col] = [(x * pivot_inv) % m for x in aug[col]]
+
+        for row in range(n):
+            factor = aug[row][col]
+            if row != col and factor:
+                aug[row] = [(x - factor * y) % m for x, y in zip(aug[row], aug[col])]
+
+    return np.array([row[n:] for row in aug[:n]])
+
+
+def recover_key(plain_blocks, cipher_blocks):
+    """
+    Recover an n x n key from aligned (blocks x n) plaintext and ciphertext
+    arrays, or return None if no key of this size reproduces the crib.
+    """
+    n = plain_blocks.shape[1]
+    windows = sliding_window_view(plain_blocks, (n, n))[:, 0]
+    invertible = np.flatnonzero(batch_full_rank(windows, 2) & batch_full_rank(windows, 13))
+
+    if invertible.size:
+        # One invertible window fixes the key; the rest of the crib must agree
+        i = invertible[0]
+        key = np.matmul(matrix_mod_inverse(windows[i]), cipher_blocks[i:i+n]) % 26
+    else:
+        key = solve_stacked(plain_blocks, cipher_blocks)
+        if key is None:
+            return None
+
+    if not np.array_equal(np.matmul(plain_blocks, key) % 26, cipher_blocks):
+        return None
+    return key
+
+
+def aligned_blocks(indices, n):
+    """
+    The complete n-letter blocks of indices as a (blocks, n) array.
+    """
+    blocks = len(indices) // n
+    return indices[:blocks * n].reshape(blocks, n)
 
 
-def attack_hill(known_plaintext, known_ciphertext):
+def repeated_key(key):
+    """
+    The smallest key (2x2 or larger) that key repeats along its diagonal
+    with zeros elsewhere, or None.
+    """
+    n = len(key)
+    for m in range(2, n):
+        if n % m == 0 and np.array_equal(key, np.kron(np.eye(n // m, dtype=key.dtype), key[:m, :m])):
+            return key[:m, :m]
+    return None
+
+
+def attack_hill(known_plaintext, known_ciphertext, key_size=None):
     
-    known_plaintext= word_mapper(known_plaintext, 'w2n')
-    known_ciphertext= word_mapper(known_ciphertext, 'w2n')
+    known_plaintext= to_indices(known_plaintext).astype(np.int64)
+    known_ciphertext= to_indices(known_ciphertext).astype(np.int64)
 
     
     if len(known_plaintext) < 4 or len(known_ciphertext) < 4:
         raise ValueError("At least 4 characters of known plaintext and ciphertext are required.")
 
+    length = min(len(known_plaintext), len(known_ciphertext))
+    known_plaintext = known_plaintext[:length]
+    known_ciphertext = known_ciphertext[:length]
+    sizes = [key_size] if key_size else range(2, MAX_KEY_SIZE + 1)
+
+    for n in sizes:
+        if length < n * n:
+            break
+
+        key = recover_key(aligned_blocks(known_plaintext, n), aligned_blocks(known_ciphertext, n))
+        if key is None:
+            continue
+
+        smaller = repeated_key(key)
+        if smaller is not None:
+            m = len(smaller)
+            plain_blocks = aligned_blocks(known_plaintext, m)
+            if not np.array_equal(np.matmul(plain_blocks, smaller) % 26, aligned_blocks(known_ciphertext, m)):
+                continue
+        return from_indices(key.ravel())
+
+    raise ValueError("The known plaintext does not determine a key that reproduces the known ciphertext modulo 26.")
+
+
+@lru_cache(maxsize=1)
+def invertible_matrices():
+    """
+    Every 2x2 matrix that is invertible mod 26, as a read-only (157248, 2, 2) array.
+    """
+    a, b, c, d = np.indices((26, 26, 26, 26)).reshape(4, -1)
+    keep = is_unit(a * d - b * c)
+    matrices = np.stack([a[keep], b[keep], c[keep], d[keep]], axis=1).reshape(-1, 2, 2)
+    matrices.flags.writeable = False
+    return matrices
+
+
+def _decrypt_all(cipher_blocks, matrices):
+    """
+    Decrypt the ciphertext under every candidate matrix at once:
+    (blocks, 2) x (B, 2, 2) -> (B, 2 * blocks).
+    """
+    plain = np.matmul(cipher_blocks[None], matrices) % 26
+    return plain.reshape(len(matrices), -1)
+
+
+def _top(scores, count):
+    count = min(count, len(scores))
+    best = np.argpartition(-scores, count - 1)[:count]
+    return best[np.argsort(-scores[best])]
+
+
+def _rank_full(cipher_blocks, top_k):
+    matrices = invertible_matrices()
+    scores = np.empty(len(matrices))
+    for start in range(0, len(matrices), SEARCH_CHUNK):
+        chunk = matrices[start:start + SEARCH_CHUNK]
+        scores[start:start + SEARCH_CHUNK] = bigram_score(_decrypt_all(cipher_blocks, chunk))
+    best = _top(scores, top_k)
+    return matrices[best], scores[best]
+
+
+def _rank_columns(cipher_blocks, top_k, candidates_per_column):
+    columns = np.indices((26, 26)).reshape(2, -1).T
+    column_scores = unigram_score((np.matmul(cipher_blocks, columns.T) % 26).T)
+    best = columns[_top(column_scores, candidates_per_column)]
 
-    plain_matrix = np.array([
-        [known_plaintext[0], known_plaintext[1]],
-        [known_plaintext[2], known_plaintext[3]]
-    ])
+    first, second = np.meshgrid(np.arange(len(best)), np.arange(len(best)), indexing='ij')
+    matrices = np.stack([best[first.ravel()], best[second.ravel()]], axis=2)
 
-    cipher_matrix= np.array([
-        [known_ciphertext[0], known_ciphertext[1]],
-        [known_ciphertext[2], known_ciphertext[3]]
-    ])
+    det = matrices[:, 0, 0] * matrices[:, 1, 1] - matrices[:, 0, 1] * matrices[:, 1, 0]
+    matrices = matrices[is_unit(det)]
+    if not len(matrices):
+        return matrices, np.empty(0)
 
-    det = int(np.round(np.linalg.det(plain_matrix))) % 26
+    scores = bigram_score(_decrypt_all(cipher_blocks, matrices))
+    best = _top(scores, top_k)
+    return matrices[best], scores[best]
 
-    if math.gcd(det, 26) != 1:
-        raise ValueError("The known plaintext matrix is not invertible modulo 26.")
 
-    P_inv = matrix_mod_inverse(plain_matrix, 26)
+def search_hill_keys(ciphertext, top_k=10, method="columns", candidates_per_column=40):
+    """
+    Ciphertext-only search for a 2x2 Hill key.
 
-    key = np.matmul(P_inv, cipher_matrix) % 26
+    Returns up to top_k (key, score) pairs, best first, where key is the
+    4-letter encryption key and score the log10 bigram likelihood of the
+    decryption. method is "columns" (fast divide and conquer) or "full"
+    (exhaustive over every invertible key).
+    """
+    cipher = to_indices(ciphertext).astype(np.int64)
+    if len(cipher) < 4 or len(cipher) % 2:
+        raise ValueError("The ciphertext must contain an even number of letters, at least 4.")
+    cipher_blocks = cipher.reshape(-1, 2)
 
-    key = word_mapper(key.flatten().tolist(), 'n2w')
+    if method == "full":
+        matrices, scores = _rank_full(cipher_blocks, top_k)
+    elif method == "columns":
+        matrices, scores = _rank_columns(cipher_blocks, top_k, candidates_per_column)
+    else:
+        raise ValueError("method must be 'columns' or 'full'.")
 
-    final_key = "".join(key)
-    return final_key
+    keys = inverse_2x2(matrices) if len(matrices) else matrices
+    return [(from_indices(key.ravel()), float(score)) for key, score in zip(keys, scores)]
 
 
 # kp = input("Enter known plaintext (min 4 letters): ")
@@ -0,0 +1,255 @@
+"""
+COMPILED KEYS
+=============
+compile_key(cipher, key) validates a key once and returns an immutable
+object holding everything derived from it: translation tables, the
+modular inverse, the Playfair position index and digraph lookups, the
+Hill matrix and its inverse.
+
+    key = compile_key('affine', (5, 8))
+    key.encrypt("attack at dawn")       # 'izzisgizxiov'
+    key.decrypt_indices(indices)        # uint8 array in, uint8 array out
+
+Compiled keys sit behind a bounded LRU cache, so hot keys in a long
+running process cost one dictionary lookup after first use.
+key_cache_info() reports hits and misses.
+
+Every API in the package (stream, batch, pipeline, server, command line)
+takes keys in the form compile_key does: caesar a shift, affine (a, b),
+playfair and hill a key string. parse_key() converts the text typed on a
+command line to that form. ciphers.hill, and with it NumPy, is only
+imported once a Hill key is compiled.
+"""
+from functools import lru_cache
+
+from ciphers import affine, ceaser, playfair
+from ciphers.alphabet import as_indices, from_indices, to_indices
+
+KEY_CACHE_SIZE = 1024
+
+
+class CompiledKey:
+    """
+    Base class: attributes are set once in __init__ and are read-only after.
+    """
+    __slots__ = ()
+
+    def _set(self, **fields):
+        for name, value in fields.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+
+class CaesarKey(CompiledKey):
+    __slots__ = ('shift', 'encrypt_table', 'decrypt_table')
+
+    def __init__(self, shift):
+        if isinstance(shift, bool) or not isinstance(shift, int):
+            raise ValueError(f"The Caesar key must be an integer shift, not {shift!r}.")
+        self._set(shift=shift,
+                  encrypt_table=ceaser.shift_table(shift),
+                  decrypt_table=ceaser.shift_table(-shift))
+
+    def __repr__(self):
+        return f"CaesarKey({self.shift})"
+
+    def encrypt(self, text):
+        return ceaser.translate_text(text, self.encrypt_table)
+
+    def decrypt(self, text):
+        return ceaser.translate_text(text, self.decrypt_table)
+
+    def encrypt_indices(self, indices):
+        return ceaser.shift_indices(indices, self.shift)
+
+    def decrypt_indices(self, indices):
+        return ceaser.shift_indices(indices, -self.shift)
+
+    def encrypt_batch(self, messages):
+        return ceaser.encrypt_batch(messages, self.shift)
+
+    def decrypt_batch(self, messages):
+        return ceaser.decrypt_batch(messages, self.shift)
+
+
+class AffineKey(CompiledKey):
+    __slots__ = ('a', 'b', 'inverse', 'encrypt_table', 'decrypt_table')
+
+    def __init__(self, key):
+        a, b = key
+        affine.validate_key(a, b)
+        self._set(a=a, b=b,
+                  inverse=affine.mod_inverse(a),
+                  encrypt_table=affine.build_table(a, b),
+                  decrypt_table=affine.build_table(a, b, decrypt=True))
+
+    def __repr__(self):
+        return f"AffineKey(a={self.a}, b={self.b})"
+
+    def encrypt(self, text, include_non_alpha=False):
+        return affine.translate_text(text, self.encrypt_table, include_non_alpha)
+
+    def decrypt(self, text, include_non_alpha=False):
+        return affine.translate_text(text, self.decrypt_table, include_non_alpha)
+
+    def encrypt_indices(self, indices):
+        # index_table is cached and needs NumPy, so it is built on first use
+        return affine.index_table(self.a, self.b)[as_indices(indices)]
+
+    def decrypt_indices(self, indices):
+        return affine.index_table(self.a, self.b, decrypt=True)[as_indices(indices)]
+
+    def encrypt_batch(self, messages, include_non_alpha=False):
+        return affine.encrypt_batch(messages, self.a, self.b, include_non_alpha)
+
+    def decrypt_batch(self, messages, include_non_alpha=False):
+        return affine.decrypt_batch(messages, self.a, self.b, include_non_alpha)
+
+
+class PlayfairKey(CompiledKey):
+    __slots__ = ('key', 'table', 'positions', 'encrypt_lookup', 'decrypt_lookup')
+
+    def __init__(self, key):
+        if not isinstance(key, str):
+            raise ValueError(f"The Playfair key must be a string, not {key!r}.")
+        table = playfair.generate_playfair_table(key)
+        self._set(key=key, table=table,
+                  positions=table.positions,
+                  encrypt_lookup=table.encrypt_lookup,
+                  decrypt_lookup=table.decrypt_lookup)
+
+    def __repr__(self):
+        return f"PlayfairKey({self.key!r})"
+
+    def encrypt(self, text):
+        message = playfair.normalize_message(text)
+        return ''.join(map(self.encrypt_lookup.__getitem__, playfair.iter_digraphs(message)))
+
+    def decrypt(self, text):
+        message = playfair.normalize_message(text)
+        return ''.join(map(self.decrypt_lookup.__getitem__, playfair.iter_pairs(message)))
+
+    def encrypt_indices(self, indices):
+        return playfair.encrypt_indices(indices, self.table)
+
+    def decrypt_indices(self, indices):
+        return playfair.decrypt_indices(indices, self.table)
+
+    def encrypt_batch(self, messages):
+        return playfair.encrypt_batch(messages, self.key)
+
+    def decrypt_batch(self, messages):
+        return playfair.decrypt_batch(messages, self.key)
+
+
+class HillKey(CompiledKey):
+    __slots__ = ('key', 'matrix', 'inverse', 'block')
+
+    def __init__(self, key):
+        if not isinstance(key, str):
+            raise ValueError(f"The Hill key must be a string, not {key!r}.")
+        from ciphers import hill
+        matrix, inverse = hill.key_schedule(key)
+        self._set(key=key, matrix=matrix, inverse=inverse, block=matrix.shape[0])
+
+    def __repr__(self):
+        return f"HillKey({self.key!r})"
+
+    def encrypt(self, text):
+        from ciphers.hill import SPECIAL_CHARS
+        return from_indices(self.encrypt_indices(to_indices(text, SPECIAL_CHARS)))
+
+    def decrypt(self, text):
+        from ciphers.hill import SPECIAL_CHARS
+        return from_indices(self.decrypt_indices(to_indices(text, SPECIAL_CHARS)))
+
+    def encrypt_indices(self, indices):
+        """
+        Pads with X to a full block and reports to the audit sink, like
+        hill.encrypt_indices.
+        """
+        import numpy as np
+        from ciphers import hill
+
+        plain = as_indices(indices)
+        if len(plain) % self.block:
+            padding = np.full(self.block - len(plain) % self.block, hill.PAD_INDEX, dtype=np.uint8)
+            plain = np.concatenate([plain, padding])
+        cipher = hill.hill_transform(plain, self.matrix).astype(np.uint8)
+        hill.record_audit(plain, self.key, cipher)
+        return cipher
+
+    def decrypt_indices(self, indices):
+        import numpy as np
+        from ciphers.hill import hill_transform
+        return hill_transform(as_indices(indices), self.inverse).astype(np.uint8)
+
+    def encrypt_batch(self, messages):
+        from ciphers import hill
+        return hill.encrypt_batch(messages, self.key)
+
+    def decrypt_batch(self, messages):
+        from ciphers import hill
+        return hill.decrypt_batch(messages, self.key)
+
+
+KEY_TYPES = {
+    'caesar': CaesarKey,
+    'affine': AffineKey,
+    'playfair': PlayfairKey,
+    'hill': HillKey,
+}
+
+CIPHERS = tuple(KEY_TYPES)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _compile_key(cipher, key):
+    try:
+        factory = KEY_TYPES[cipher]
+    except KeyError:
+        raise ValueError(f"Unknown cipher '{cipher}'. Choose from: {', '.join(KEY_TYPES)}") from None
+    return factory(key)
+
+
+def compile_key(cipher, key):
+    """
+    Return the compiled key object for a cipher and key, from the cache
+    when possible.
+    """
+    if isinstance(key, list):
+        key = tuple(key)
+    return _compile_key(cipher, key)
+
+
+def parse_key(cipher, text):
+    """
+    Convert a key typed on a command line ("3", "5,8", "HILL") to the form
+    compile_key expects.
+    """
+    try:
+        if cipher == 'caesar':
+            return int(text)
+        if cipher == 'affine':
+            a, b = text.split(',')
+            return int(a), int(b)
+    except ValueError:
+        expected = "an integer shift" if cipher == 'caesar' else "two integers 'a,b'"
+        raise ValueError(f"The {cipher} key must be {expected}, not {text!r}.") from None
+    return text
+
+
+def key_cache_info():
+    """
+    Hits, misses, maxsize and current size of the compiled-key cache.
+    """
+    return _compile_key.cache_info()
+
+
+def clear_key_cache():
+    _compile_key.cache_clear()
@@ -0,0 +1,256 @@
+"""
+INSTRUMENTATION
+===============
+Opt-in per-stage timing and counters for every cipher. Nothing is
+recorded until a recorder is installed; while metrics are disabled an
+instrumented call costs one function call returning NULL_PROBE, plus an
+empty method call per mark.
+
+    recorder = enable_metrics()
+    ...
+    recorder.snapshot()            # nested dict
+    print(recorder.to_prometheus())
+    disable_metrics()
+
+Entry points time their stages with a probe. Each mark charges the time
+since the previous mark (or since start) to a stage:
+
+    probe = metrics.start('hill', 'encrypt', len(text))
+    matrix = generate_key(key)
+    probe.mark('key_setup')
+
+Stages are normalize, key_setup, transform, output and bank_write (the
+audit file append, on the sink's thread); the stream adds input. Each
+stage keeps calls, seconds and bytes; each operation (encrypt, decrypt)
+keeps calls and bytes. Bytes are input characters. Snapshots also report
+hits and misses of the key caches of every cipher module loaded so far.
+
+Set PYCIPHER_METRICS=path before running main.py to write a dump on exit:
+Prometheus text for a .prom path, JSON otherwise.
+"""
+import json
+import sys
+import threading
+import time
+
+ENV_VAR = 'PYCIPHER_METRICS'
+
+# (module, cached function) pairs reported in snapshots once loaded
+CACHES = (
+    ('ciphers.ceaser', 'shift_table'),
+    ('ciphers.affine', 'build_table'),
+    ('ciphers.playfair', 'generate_playfair_table'),
+    ('ciphers.hill', 'key_schedule'),
+    ('ciphers.keys', '_compile_key'),
+)
+
+
+class Probe:
+    """
+    Lap timer for one call through an entry point.
+    """
+    __slots__ = ('recorder', 'cipher', 'nbytes', 'last')
+
+    def __init__(self, recorder, cipher, nbytes):
+        self.recorder = recorder
+        self.cipher = cipher
+        self.nbytes = nbytes
+        self.last = time.perf_counter()
+
+    def mark(self, stage, nbytes=None):
+        """
+        Charge the time since the previous mark to stage.
+        """
+        now = time.perf_counter()
+        self.recorder.record(self.cipher, stage, now - self.last, self.nbytes if nbytes is None else nbytes)
+        self.last = now
+
+
+class NullProbe:
+    """
+    Stands in for a Probe while metrics are disabled: mark does nothing.
+    """
+    __slots__ = ()
+
+    def mark(self, stage, nbytes=None):
+        pass
+
+
+NULL_PROBE = NullProbe()
+
+
+def cache_stats():
+    """
+    Hits, misses and size of the key caches of the loaded cipher modules.
+    """
+    stats = {}
+    for module_name, name in CACHES:
+        module = sys.modules.get(module_name)
+        if module is None:
+            continue
+        info = getattr(module, name).cache_info()
+        stats[f"{module_name.rsplit('.', 1)[1]}.{name}"] = {
+            'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
+    return stats
+
+
+def _labels(**labels):
+    return ','.join(f'{name}="{value}"' for name, value in labels.items())
+
+
+class MetricsRecorder:
+    """
+    Thread-safe totals per (cipher, stage) and per (cipher, operation).
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.operations = {}
+
+    def count(self, cipher, op, nbytes=0):
+        with self.lock:
+            entry = self.operations.setdefault((cipher, op), [0, 0])
+            entry[0] += 1
+            entry[1] += nbytes
+
+    def record(self, cipher, stage, seconds, nbytes=0):
+        with self.lock:
+            entry = self.stages.setdefault((cipher, stage), [0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] += nbytes
+
+    def reset(self):
+        with self.lock:
+            self.stages.clear()
+            self.operations.clear()
+            self.started = time.perf_counter()
+
+    def snapshot(self):
+        """
+        Copy of every counter as a JSON-serializable dict.
+        """
+        with self.lock:
+            stages = {key: list(entry) for key, entry in self.stages.items()}
+            operations = {key: list(entry) for key, entry in self.operations.items()}
+
+        ciphers = {}
+        for (cipher, op), (calls, nbytes) in sorted(operations.items()):
+            entry = ciphers.setdefault(cipher, {'operations': {}, 'stages': {}})
+            entry['operations'][op] = {'calls': calls, 'bytes': nbytes}
+        for (cipher, stage), (calls, seconds, nbytes) in sorted(stages.items()):
+            entry = ciphers.setdefault(cipher, {'operations': {}, 'stages': {}})
+            entry['stages'][stage] = {'calls': calls, 'seconds': seconds, 'bytes': nbytes}
+
+        return {
+            'uptime_s': time.perf_counter() - self.started,
+            'ciphers': ciphers,
+            'caches': cache_stats(),
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self):
+        """
+        The snapshot in the Prometheus text exposition format.
+        """
+        snapshot = self.snapshot()
+        families = {}
+
+        def add(name, kind, help_text, labels, value):
+            family = families.setdefault(name, (kind, help_text, []))
+            family[2].append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+
+        add('pycipher_uptime_seconds', 'gauge', "Seconds since metrics were enabled.", '',
+            snapshot['uptime_s'])
+        for cipher, entry in snapshot['ciphers'].items():
+            for op, totals in entry['operations'].items():
+                labels = _labels(cipher=cipher, op=op)
+                add('pycipher_operation_calls_total', 'counter', "Encrypt and decrypt calls.", labels,
+                    totals['calls'])
+                add('pycipher_operation_bytes_total', 'counter', "Characters passed to encrypt and decrypt.",
+                    labels, totals['bytes'])
+            for stage, totals in entry['stages'].items():
+                labels = _labels(cipher=cipher, stage=stage)
+                add('pycipher_stage_calls_total', 'counter', "Times each stage ran.", labels, totals['calls'])
+                add('pycipher_stage_seconds_total', 'counter', "Wall time spent in each stage.", labels,
+                    totals['seconds'])
+                add('pycipher_stage_bytes_total', 'counter', "Characters handled by each stage.", labels,
+                    totals['bytes'])
+        for cache, info in snapshot['caches'].items():
+            labels = _labels(cache=cache)
+            add('pycipher_cache_hits_total', 'counter', "Key cache hits.", labels, info['hits'])
+            add('pycipher_cache_misses_total', 'counter', "Key cache misses.", labels, info['misses'])
+            add('pycipher_cache_entries', 'gauge', "Keys currently cached.", labels, info['size'])
+
+        lines = []
+        for name, (kind, help_text, samples) in families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path):
+        """
+        Write Prometheus text to a .prom path and JSON to anything else.
+        """
+        text = self.to_prometheus() if path.endswith('.prom') else self.to_json() + '\n'
+        with open(path, 'w') as f:
+            f.write(text)
+
+
+_recorder = None
+
+
+def start(cipher, op=None, nbytes=0):
+    """
+    Begin timing a call: returns a Probe, or NULL_PROBE while metrics are
+    disabled. With op the call is also counted as an operation.
+    """
+    recorder = _recorder
+    if recorder is None:
+        return NULL_PROBE
+    if op is not None:
+        recorder.count(cipher, op, nbytes)
+    return Probe(recorder, cipher, nbytes)
+
+
+def count(cipher, op, nbytes=0):
+    """
+    Count an operation whose size is only known once it has finished.
+    """
+    recorder = _recorder
+    if recorder is not None:
+        recorder.count(cipher, op, nbytes)
+
+
+def get_recorder():
+    return _recorder
+
+
+def set_recorder(recorder):
+    """
+    Install a recorder and return the previous one. Pass None to disable.
+    """
+    global _recorder
+    previous = _recorder
+    _recorder = recorder
+    return previous
+
+
+def enable_metrics():
+    """
+    Start recording if not already and return the active recorder.
+    """
+    if _recorder is None:
+        set_recorder(MetricsRecorder())
+    return _recorder
+
+
+def disable_metrics():
+    """
+    Stop recording and return the recorder that was active, if any.
+    """
+    return set_recorder(None)
@@ -0,0 +1,94 @@
+"""
+MODULAR ARITHMETIC
+==================
+Shared helpers for arithmetic modulo 26 (or any other modulus).
+
+- mod_inverse(a, m) is a table lookup for m = 26 and pow(a, -1, m) otherwise.
+- inverse_table(m) gives every inverse mod m as an array (0 where none
+  exists), so vector_inverse() can invert thousands of determinants in one
+  indexing operation.
+- is_unit() tests invertibility elementwise.
+- inverse_2x2() inverts a whole stack of 2x2 matrices at once through
+  their adjugates.
+
+The scalar helpers are pure Python; NumPy is imported by the array
+helpers when they first run.
+"""
+import math
+from functools import lru_cache
+
+MODULUS = 26
+
+
+def _inverses(m):
+    return tuple(pow(a, -1, m) if math.gcd(a, m) == 1 else 0 for a in range(m))
+
+
+# INVERSES_26[a] is the inverse of a mod 26, or 0 if a is not invertible
+INVERSES_26 = _inverses(MODULUS)
+
+
+def mod_inverse(a, m=MODULUS):
+    """
+    Inverse of a modulo m. Raises ValueError if none exists.
+    """
+    if m == MODULUS:
+        inverse = INVERSES_26[a % m]
+        if inverse:
+            return inverse
+    else:
+        try:
+            return pow(a, -1, m)
+        except ValueError:
+            pass
+    raise ValueError(f"{a} has no inverse modulo {m}")
+
+
+@lru_cache(maxsize=16)
+def inverse_table(m=MODULUS):
+    """
+    Read-only int64 array of the inverse of every residue mod m, 0 where
+    none exists.
+    """
+    import numpy as np
+
+    table = np.array(_inverses(m), dtype=np.int64)
+    table.flags.writeable = False
+    return table
+
+
+def vector_inverse(values, m=MODULUS):
+    """
+    Elementwise inverse mod m of an integer array; 0 where none exists.
+    """
+    import numpy as np
+
+    return inverse_table(m)[np.asarray(values) % m]
+
+
+def is_unit(values, m=MODULUS):
+    """
+    Elementwise test for invertibility mod m.
+    """
+    import numpy as np
+
+    return inverse_table(m)[np.asarray(values) % m] != 0
+
+
+def inverse_2x2(matrices, m=MODULUS):
+    """
+    Invert a (B, 2, 2) stack of matrices mod m. Every matrix must be
+    invertible; raises ValueError otherwise.
+    """
+    import numpy as np
+
+    matrices = np.asarray(matrices, dtype=np.int64)
+    a, b = matrices[:, 0, 0], matrices[:, 0, 1]
+    c, d = matrices[:, 1, 0], matrices[:, 1, 1]
+
+    det_inv = vector_inverse(a * d - b * c, m)
+    if not det_inv.all():
+        raise ValueError(f"Not every matrix is invertible modulo {m}.")
+
+    adjugate = np.stack([d, -b, -c, a], axis=1).reshape(-1, 2, 2)
+    return (adjugate * det_inv[:, None, None]) % m
@@ -0,0 +1,86 @@
+"""
+RECORD PACKING
+==============
+Helpers for the batch APIs. Many short messages are packed into one
+contiguous uint8 buffer plus an offsets array (record i is
+buffer[offsets[i]:offsets[i+1]]), processed in a single vectorized pass,
+and split back out.
+"""
+import numpy as np
+
+from ciphers import alphabet
+
+
+def byte_mask(*groups):
+    """
+    Build a 256-entry boolean mask that is True for every byte in groups.
+    """
+    mask = np.zeros(256, dtype=bool)
+    for group in groups:
+        mask[np.frombuffer(group, dtype=np.uint8)] = True
+    return mask
+
+
+def pack(messages):
+    """
+    Pack ASCII strings into (buffer, offsets).
+    Raises UnicodeEncodeError if a message is not ASCII.
+    """
+    encoded = [message.encode('ascii') for message in messages]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+def compact(buffer, offsets, keep):
+    """
+    Drop every byte whose entry in the 256-entry keep mask is False.
+    Returns the new (buffer, offsets).
+    """
+    mask = keep[buffer]
+    kept = np.zeros(len(mask) + 1, dtype=np.int64)
+    np.cumsum(mask, out=kept[1:])
+    return buffer[mask], kept[offsets]
+
+
+def pad(buffer, offsets, block, fill):
+    """
+    Pad every record with fill up to a multiple of block.
+    Returns the new (buffer, offsets).
+    """
+    lengths = np.diff(offsets)
+    padded = lengths + (-lengths % block)
+
+    new_offsets = np.zeros_like(offsets)
+    np.cumsum(padded, out=new_offsets[1:])
+
+    out = np.full(new_offsets[-1], fill, dtype=buffer.dtype)
+    shift = new_offsets[:-1] - offsets[:-1]
+    out[np.arange(len(buffer)) + np.repeat(shift, lengths)] = buffer
+    return out, new_offsets
+
+
+def pack_letters(messages, allowed):
+    """
+    Pack messages and keep only their letters, upper-casing non-ASCII
+    messages first. Returns (buffer, offsets) of ASCII letter bytes, or
+    None if a message holds a byte outside the 256-entry allowed mask.
+    """
+    messages = [m if m.isascii() else m.upper() for m in messages]
+    try:
+        buffer, offsets = pack(messages)
+    except UnicodeEncodeError:
+        return None
+
+    if not allowed[buffer].all():
+        return None
+    return compact(buffer, offsets, alphabet.LETTER_MASK)
+
+
+def unpack(buffer, offsets):
+    """
+    Split an ASCII byte buffer back into a list of strings.
+    """
+    text = buffer.tobytes().decode('ascii')
+    bounds = offsets.tolist()
+    return [text[start:stop] for start, stop in zip(bounds, bounds[1:])]
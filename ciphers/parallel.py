@@ -0,0 +1,164 @@
+"""
+PARALLEL ENCRYPTION
+===================
+Split large inputs into shards and encrypt them on several cores with a
+ProcessPoolExecutor.
+
+Caesar and Affine work character by character, and Hill works on
+independent n-letter blocks once the text is normalized, so each shard can
+be handed to the existing cipher functions on its own. The input and the
+output live in shared memory; workers receive only the buffer names and
+their shard offsets, never pickled strings. Results are stitched back
+together in shard order.
+
+    ciphertext = parallel_encrypt(text, "hill", "GYBNQKURP", workers=8)
+
+Playfair is not supported: digraph splitting depends on every preceding
+letter, so the text cannot be cut into independent shards.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ciphers import affine, ceaser, hill
+from ciphers.audit import get_audit_sink
+
+MIN_SHARD_SIZE = 256 * 1024
+
+PARALLEL_CIPHERS = ('caesar', 'affine', 'hill')
+
+
+def _shards(size, count, align):
+    """
+    Cut [0, size) into at most count ranges whose boundaries are multiples of align.
+    """
+    step = -(-size // count)
+    step += -step % align
+    return [(start, min(start + step, size)) for start in range(0, size, max(step, align))]
+
+
+def _transform_hill(key, decrypt, letters):
+    key_matrix, key_inv = hill.key_schedule(key)
+    return hill.hill_transform(letters, key_inv if decrypt else key_matrix).astype(np.uint8)
+
+
+def _transform_text(cipher, key, decrypt, options, text):
+    if cipher == 'hill':
+        data, _ = _prepare(text, cipher, key, decrypt)
+        letters = np.frombuffer(data, dtype=np.uint8)
+        result = _transform_hill(key, decrypt, letters)
+        if not decrypt:
+            hill.record_audit(letters, key, result)
+        return hill.hill_indices_to_text(result)
+    if cipher == 'caesar':
+        return ceaser.retrieve_plaintext(text, key) if decrypt else ceaser.calculate_cipher(text, key)
+    a, b = key
+    if decrypt:
+        return affine.affine_decrypt(text, a, b, **options)
+    return affine.affine_encrypt(text, a, b, **options)
+
+
+def _run_shard(cipher, key, decrypt, options, in_name, out_name, start, stop):
+    """
+    Worker entry point: transform one shard of the shared input buffer into
+    the same offsets of the shared output buffer. Returns the number of
+    bytes written.
+    """
+    src = shared_memory.SharedMemory(name=in_name, track=False)
+    dst = shared_memory.SharedMemory(name=out_name, track=False)
+    try:
+        if cipher == 'hill':
+            letters = np.frombuffer(bytes(src.buf[start:stop]), dtype=np.uint8)
+            result = _transform_hill(key, decrypt, letters)
+        else:
+            text = bytes(src.buf[start:stop]).decode('ascii')
+            result = _transform_text(cipher, key, decrypt, options, text).encode('ascii')
+        dst.buf[start:start + len(result)] = result
+        return len(result)
+    finally:
+        src.close()
+        dst.close()
+
+
+def _prepare(text, cipher, key, decrypt):
+    """
+    Return (input bytes, block alignment) for a cipher, normalizing Hill
+    text to 0-25 letter positions and padding plaintext to a full block.
+    """
+    if cipher == 'hill':
+        block = hill.generate_key(key).shape[0]
+        letters = hill.hill_word_mapper(text, 'w2n', pad=not decrypt, block=block)
+        if len(letters) % block:
+            raise ValueError(f"Ciphertext length must be a multiple of {block}.")
+        return letters.tobytes(), block
+    return text.encode('ascii'), 1
+
+
+def parallel_transform(text, cipher, key, decrypt=False, workers=None, executor=None, **options):
+    """
+    Encrypt (or decrypt) text across a pool of worker processes.
+
+    workers sets the pool size (default: os.cpu_count()). An existing
+    executor may be passed in to avoid paying pool start-up on every call.
+    Small inputs, and non-ASCII Caesar/Affine text, run in this process.
+    """
+    if cipher not in PARALLEL_CIPHERS:
+        raise ValueError(f"Parallel mode supports {', '.join(PARALLEL_CIPHERS)}, not '{cipher}'.")
+
+    workers = workers or os.cpu_count() or 1
+
+    if len(text) < MIN_SHARD_SIZE or workers == 1 or (cipher != 'hill' and not text.isascii()):
+        return _transform_text(cipher, key, decrypt, options, text)
+
+    data, block = _prepare(text, cipher, key, decrypt)
+    if not data:
+        return ''
+
+    # Workers cannot reach this process's audit sink; Hill encryption is
+    # recorded here as one entry once the shards are joined
+    audit = cipher == 'hill' and not decrypt and get_audit_sink().enabled
+
+    count = max(1, min(workers, len(data) // MIN_SHARD_SIZE))
+    shards = _shards(len(data), count, block)
+
+    # Start the pool before allocating shared memory so a failing
+    # constructor cannot leak the segments
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    src = dst = None
+    try:
+        src = shared_memory.SharedMemory(create=True, size=len(data))
+        dst = shared_memory.SharedMemory(create=True, size=len(data))
+        src.buf[:len(data)] = data
+        if not audit:
+            del data
+        futures = [
+            pool.submit(_run_shard, cipher, key, decrypt, options, src.name, dst.name, start, stop)
+            for start, stop in shards
+        ]
+        lengths = [future.result() for future in futures]
+
+        out = b''.join(dst.buf[start:start + length] for (start, _), length in zip(shards, lengths))
+    finally:
+        if executor is None:
+            pool.shutdown()
+        for segment in (src, dst):
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+
+    if cipher == 'hill':
+        result = np.frombuffer(out, dtype=np.uint8)
+        if audit:
+            hill.record_audit(np.frombuffer(data, dtype=np.uint8), key, result)
+        return hill.hill_indices_to_text(result)
+    return out.decode('ascii')
+
+
+def parallel_encrypt(text, cipher, key, workers=None, executor=None, **options):
+    return parallel_transform(text, cipher, key, decrypt=False, workers=workers, executor=executor, **options)
+
+
+def parallel_decrypt(text, cipher, key, workers=None, executor=None, **options):
+    return parallel_transform(text, cipher, key, decrypt=True, workers=workers, executor=executor, **options)
@@ -0,0 +1,216 @@
+"""
+CIPHER PIPELINES
+================
+Chain ciphers and run the whole cascade as one pass over the data:
+
+    pipe = Pipeline([('caesar', 3), ('affine', (5, 8)), ('hill', 'HILL')])
+    ciphertext = pipe.encrypt("attack at dawn")
+    plaintext = pipe.decrypt(ciphertext)
+
+Keys take the forms described in ciphers.keys.
+
+Caesar, Affine and Hill are all affine maps over blocks of letters,
+C = P x M + v (mod 26): Caesar is Affine with a=1, Affine is M = a*I, and
+Hill is v = 0. Adjacent stages therefore compose algebraically into a
+single (M, v) on blocks of the largest Hill size (a Hill key acts
+block-diagonally on longer blocks), and run as one matmul. Fused maps on
+one or two letters are compiled into a lookup table over every possible
+block (26 or 676 entries), so e.g. Caesar -> Affine -> 2x2 Hill is a
+single gather. Playfair is not linear and runs as its own stage between
+fused segments.
+
+Text is reduced to its letters before the first stage. A fused segment
+pads its input to a whole block with the letter that its leading
+Caesar/Affine stages turn into X, so the Hill stage sees the same X
+padding it would get on its own, and the result equals applying the
+stages one after the other.
+
+Padding and Playfair's filler letters change the length of the text, so
+some neighbours could not be decrypted: a Hill block that does not divide
+the block before it pads text that decryption cannot remove, a Hill block
+of odd size after Playfair leaves Playfair an odd-length ciphertext, and
+Playfair's fillers after a Hill block of more than two letters break
+Hill's blocks. Pipeline rejects those cascades when it is built.
+
+Hill stages in a pipeline are not reported to the audit sink
+(ciphers.audit): a fused segment never computes the Hill stage's own
+input and output, only those of the whole segment.
+"""
+import numpy as np
+
+from ciphers import hill
+from ciphers.alphabet import NON_LETTERS, as_indices, from_indices, normalize, to_indices
+from ciphers.keys import AffineKey, CaesarKey, PlayfairKey, compile_key
+
+class _Linear:
+    """
+    A fused run of Caesar/Affine/Hill stages: C = P x matrix + offset.
+    """
+    def __init__(self, matrix, offset, pad=hill.PAD_INDEX):
+        self.matrix = matrix % 26
+        self.offset = offset % 26
+        self.block = len(matrix)
+        self.pad = pad
+        self.compiled = {}
+
+    @classmethod
+    def from_key(cls, compiled):
+        if isinstance(compiled, CaesarKey):
+            return cls(np.ones((1, 1), dtype=np.int64), np.array([compiled.shift], dtype=np.int64))
+        if isinstance(compiled, AffineKey):
+            return cls(np.array([[compiled.a]], dtype=np.int64), np.array([compiled.b], dtype=np.int64))
+        return cls(compiled.matrix.astype(np.int64), np.zeros(compiled.block, dtype=np.int64))
+
+    def widen(self, block):
+        """
+        The same map acting on blocks of a multiple of its block size.
+        """
+        repeat = block // self.block
+        return _Linear(np.kron(np.eye(repeat, dtype=np.int64), self.matrix), np.tile(self.offset, repeat), self.pad)
+
+    def then(self, other):
+        """
+        Compose with a later stage. Its block must divide this one's
+        (unless this is a single-letter stage), so that it never pads.
+        """
+        if self.block > 1 and self.block % other.block:
+            raise ValueError(f"A Hill block of {other.block} letters cannot follow a block of {self.block}: "
+                             "its padding could not be removed on decryption.")
+        block = max(self.block, other.block)
+        pad = self.pad
+        if self.block == 1:
+            # Pad with the letter this stage maps to the later padding letter
+            pad = int(np.flatnonzero(self.compile(False) == other.pad)[0])
+
+        first, second = self.widen(block), other.widen(block)
+        # (P M1 + v1) M2 + v2 = P (M1 M2) + (v1 M2 + v2)
+        return _Linear(first.matrix @ second.matrix, first.offset @ second.matrix + second.offset, pad)
+
+    def compile(self, decrypt):
+        """
+        Return the lookup table (blocks of 1 or 2 letters) or the int32
+        (matrix, offset) pair for one direction, computing it on first use.
+        """
+        if decrypt not in self.compiled:
+            matrix, offset = self.matrix, self.offset
+            if decrypt:
+                matrix = hill.matrix_mod_inverse(self.matrix)
+                offset = -(self.offset @ matrix) % 26
+
+            if self.block <= 2:
+                blocks = np.indices((26,) * self.block).reshape(self.block, -1).T
+                table = ((blocks @ matrix + offset) % 26).astype(np.uint8)
+                # One uint16 per two-letter block, so a gather moves both letters
+                compiled = table.ravel() if self.block == 1 else table.view(np.uint16).ravel()
+            else:
+                compiled = (matrix.astype(np.int32), offset.astype(np.int32))
+            self.compiled[decrypt] = compiled
+        return self.compiled[decrypt]
+
+    def apply(self, indices, decrypt=False):
+        compiled = self.compile(decrypt)
+        if self.block == 1:
+            return compiled[indices]
+
+        if len(indices) % self.block:
+            if decrypt:
+                raise ValueError(f"Ciphertext length must be a multiple of {self.block}.")
+            padding = np.full(self.block - len(indices) % self.block, self.pad, dtype=np.uint8)
+            indices = np.concatenate([indices, padding])
+        blocks = indices.reshape(-1, self.block)
+
+        if self.block == 2:
+            return compiled[blocks[:, 0].astype(np.uint16) * 26 + blocks[:, 1]].view(np.uint8)
+
+        matrix, offset = compiled
+        out = blocks.astype(np.int32) @ matrix
+        out += offset
+        out %= 26
+        return out.astype(np.uint8).reshape(-1)
+
+    def encrypt(self, indices):
+        return self.apply(indices)
+
+    def decrypt(self, indices):
+        return self.apply(indices, decrypt=True)
+
+
+class _Playfair:
+    def __init__(self, compiled):
+        self.compiled = compiled
+
+    def encrypt(self, indices):
+        return self.compiled.encrypt_indices(indices)
+
+    def decrypt(self, indices):
+        return self.compiled.decrypt_indices(indices)
+
+
+def _letters(text):
+    if text.isascii():
+        return to_indices(text, NON_LETTERS)
+    return to_indices(normalize(text))
+
+
+def _fuse(stages):
+    segments = []
+    for cipher, key in stages:
+        compiled = compile_key(cipher, key)
+        if isinstance(compiled, PlayfairKey):
+            segments.append(_Playfair(compiled))
+            continue
+
+        stage = _Linear.from_key(compiled)
+        if segments and isinstance(segments[-1], _Linear):
+            segments[-1] = segments[-1].then(stage)
+        else:
+            segments.append(stage)
+    return segments
+
+
+def _check_neighbours(segments):
+    """
+    Raise ValueError for Playfair next to a block size that decrypt()
+    could not undo.
+    """
+    for before, after in zip(segments, segments[1:]):
+        if isinstance(before, _Playfair) and isinstance(after, _Linear) and after.block % 2 and after.block > 1:
+            raise ValueError(f"A Hill block of odd size ({after.block}) cannot follow Playfair: its padding "
+                             "would leave Playfair an odd-length ciphertext to decrypt.")
+        if isinstance(before, _Linear) and isinstance(after, _Playfair) and before.block > 2:
+            raise ValueError(f"Playfair cannot follow a Hill block of more than two letters ({before.block}): "
+                             "its filler letters would break the Hill blocks on decryption.")
+
+
+class Pipeline:
+    """
+    A cascade of (cipher, key) stages, applied in order on encryption and
+    in reverse on decryption.
+    """
+    def __init__(self, stages):
+        self.stages = tuple((cipher, key) for cipher, key in stages)
+        if not self.stages:
+            raise ValueError("A pipeline needs at least one stage.")
+        self.segments = _fuse(self.stages)
+        _check_neighbours(self.segments)
+
+    def __repr__(self):
+        return f"Pipeline({list(self.stages)!r})"
+
+    def encrypt_indices(self, indices):
+        indices = as_indices(indices)
+        for segment in self.segments:
+            indices = segment.encrypt(indices)
+        return indices
+
+    def decrypt_indices(self, indices):
+        indices = as_indices(indices)
+        for segment in reversed(self.segments):
+            indices = segment.decrypt(indices)
+        return indices
+
+    def encrypt(self, text):
+        return from_indices(self.encrypt_indices(_letters(text)))
+
+    def decrypt(self, text):
+        return from_indices(self.decrypt_indices(_letters(text)))
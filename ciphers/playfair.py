@@ -1,6 +1,55 @@
+from functools import cached_property, lru_cache
+
+from ciphers import metrics
+from ciphers.alphabet import as_indices, normalize
+
+J_INDEX, I_INDEX, X_INDEX, Z_INDEX = 9, 8, 23, 25
+
+
+class PlayfairTable(tuple):
+    """
+    A compiled 5x5 Playfair table.
+
+    Behaves like the plain table (a tuple of five rows of letters) and also
+    carries a letter -> (row, col) index plus full digraph -> digraph
+    lookups for encryption and decryption, so converting a digraph is a
+    single dictionary read. The NumPy lookups for the integer API are
+    built on first use.
+    """
+    def __new__(cls, letters):
+        self = super().__new__(cls, (tuple(letters[i*5:(i+1)*5]) for i in range(5)))
+        self.positions = {char: divmod(i, 5) for i, char in enumerate(letters)}
+        self.encrypt_lookup = {a + b: shift_digraph(a + b, self, 1) for a in letters for b in letters}
+        self.decrypt_lookup = {a + b: shift_digraph(a + b, self, -1) for a in letters for b in letters}
+        return self
+
+    @cached_property
+    def encrypt_indices(self):
+        return _index_lookup(self.encrypt_lookup)
+
+    @cached_property
+    def decrypt_indices(self):
+        return _index_lookup(self.decrypt_lookup)
+
+
+def _index_lookup(lookup):
+    """
+    Turn a digraph lookup into a (26*26, 2) array over letter positions,
+    indexed by first*26 + second.
+    """
+    import numpy as np
+
+    table = np.zeros((26 * 26, 2), dtype=np.uint8)
+    for digraph, result in lookup.items():
+        first, second = (ord(c) - ord('A') for c in digraph)
+        table[first * 26 + second] = [ord(c) - ord('A') for c in result]
+    table.flags.writeable = False
+    return table
+
+
+@lru_cache(maxsize=128)
 def generate_playfair_table(key):
-    key = key.upper().replace('J', 'I')
-    key = ''.join([c for c in key if c.isalpha()])
+    key = normalize_message(key)
     
     seen = set()
     unique_chars = []
@@ -15,47 +64,82 @@ def generate_playfair_table(key):
             unique_chars.append(char)
             seen.add(char)
     
-    table = []
-    for i in range(5):
-        row = unique_chars[i*5:(i+1)*5]
-        table.append(row)
-    
-    return table
+    return PlayfairTable(unique_chars)
 
 
-def preprocess_message(message):
-    message = message.upper().replace('J', 'I')
-    message = ''.join([c for c in message if c.isalpha()])
-    
-    digraphs = []
+def normalize_message(message):
+    return normalize(message).replace('J', 'I')
+
+
+def iter_digraphs(message, pad=True):
+    """
+    Yield the digraphs of a normalized message, inserting X (or Z after X)
+    between double letters and after a trailing single letter.
+
+    With pad=False a trailing single letter is yielded unpadded, as a
+    one-character string, so a stream can hold it back for the next chunk.
+    """
     i = 0
+    length = len(message)
     
-    while i < len(message):
+    while i < length:
         char1 = message[i]
         
-        if i + 1 < len(message):
+        if i + 1 < length:
             char2 = message[i + 1]
             
             if char1 == char2:
                 if char1 == 'X':
-                    digraphs.append(char1 + 'Z')
+                    yield char1 + 'Z'
                 else:
-                    digraphs.append(char1 + 'X')
+                    yield char1 + 'X'
                 i += 1
             else:
-                digraphs.append(char1 + char2)
+                yield char1 + char2
                 i += 2
+        elif not pad:
+            yield char1
+            i += 1
         else:
             if char1 == 'X':
-                digraphs.append('XZ')
+                yield 'XZ'
             else:
-                digraphs.append(char1 + 'X')
+                yield char1 + 'X'
             i += 1
-    
-    return digraphs
+
+
+def iter_pairs(message):
+    """
+    Yield consecutive two-letter slices of a normalized ciphertext.
+    """
+    if len(message) % 2:
+        raise ValueError("Ciphertext length must be even.")
+    return (message[i:i+2] for i in range(0, len(message), 2))
+
+
+def split_digraphs(message, final=True):
+    """
+    Split a normalized message into a list of digraphs.
+
+    With final=False the trailing single letter is not padded; it is
+    returned as the second element so a stream can prepend it to the next
+    chunk. With final=True the remainder is always empty.
+    """
+    digraphs = list(iter_digraphs(message, pad=final))
+    if digraphs and len(digraphs[-1]) == 1:
+        return digraphs, digraphs.pop()
+    return digraphs, ''
+
+
+def preprocess_message(message):
+    return list(iter_digraphs(normalize_message(message)))
 
 
 def find_position(char, table):
+    positions = getattr(table, 'positions', None)
+    if positions is not None:
+        return positions.get(char)
+
     for row in range(5):
         for col in range(5):
             if table[row][col] == char:
@@ -63,65 +147,168 @@ def find_position(char, table):
     return None
 
 
-def encrypt_digraph(digraph, table):
+def shift_digraph(digraph, table, step):
+    """
+    Apply the Playfair rules to one digraph: step=1 encrypts, step=-1 decrypts.
+    """
     char1, char2 = digraph[0], digraph[1]
     row1, col1 = find_position(char1, table)
     row2, col2 = find_position(char2, table)
     
     if row1 == row2:
-        new_col1 = (col1 + 1) % 5
-        new_col2 = (col2 + 1) % 5
+        new_col1 = (col1 + step) % 5
+        new_col2 = (col2 + step) % 5
         return table[row1][new_col1] + table[row2][new_col2]
     elif col1 == col2:
-        new_row1 = (row1 + 1) % 5
-        new_row2 = (row2 + 1) % 5
+        new_row1 = (row1 + step) % 5
+        new_row2 = (row2 + step) % 5
         return table[new_row1][col1] + table[new_row2][col2]
     else:
         return table[row1][col2] + table[row2][col1]
 
 
+def encrypt_digraph(digraph, table):
+    lookup = getattr(table, 'encrypt_lookup', None)
+    if lookup is not None:
+        return lookup[digraph]
+    return shift_digraph(digraph, table, 1)
+
+
 def decrypt_digraph(digraph, table):
-    char1, char2 = digraph[0], digraph[1]
-    row1, col1 = find_position(char1, table)
-    row2, col2 = find_position(char2, table)
-    
-    if row1 == row2:
-        new_col1 = (col1 - 1) % 5
-        new_col2 = (col2 - 1) % 5
-        return table[row1][new_col1] + table[row2][new_col2]
-    elif col1 == col2:
-        new_row1 = (row1 - 1) % 5
-        new_row2 = (row2 - 1) % 5
-        return table[new_row1][col1] + table[new_row2][col2]
-    else:
-        return table[row1][col2] + table[row2][col1]
+    lookup = getattr(table, 'decrypt_lookup', None)
+    if lookup is not None:
+        return lookup[digraph]
+    return shift_digraph(digraph, table, -1)
 
 
-def encrypt(plaintext, key):
+def encrypt(plaintext, key, details=True):
+    """
+    Encrypt plaintext with a Playfair key.
+
+    Returns (ciphertext, table, digraphs), or only the ciphertext when
+    details=False. The lean form never builds the digraph list: digraphs
+    are streamed from a generator through the table's lookup into a single
+    join.
+    """
+    probe = metrics.start('playfair', 'encrypt', len(plaintext))
     table = generate_playfair_table(key)
-    digraphs = preprocess_message(plaintext)
-    
-    ciphertext = ''
-    for digraph in digraphs:
-        ciphertext += encrypt_digraph(digraph, table)
+    probe.mark('key_setup')
+    message = normalize_message(plaintext)
+    probe.mark('normalize')
+
+    if not details:
+        ciphertext = ''.join(map(table.encrypt_lookup.__getitem__, iter_digraphs(message)))
+        probe.mark('transform')
+        return ciphertext
+
+    digraphs = list(iter_digraphs(message))
+    ciphertext = ''.join(map(table.encrypt_lookup.__getitem__, digraphs))
+    probe.mark('transform')
     
     return ciphertext, table, digraphs
 
 
-def decrypt(ciphertext, key):
+def decrypt(ciphertext, key, details=True):
+    """
+    Decrypt ciphertext with a Playfair key.
+
+    Returns (plaintext, table, digraphs), or only the plaintext when
+    details=False.
+    """
+    probe = metrics.start('playfair', 'decrypt', len(ciphertext))
     table = generate_playfair_table(key)
-    
-    ciphertext = ciphertext.upper().replace('J', 'I')
-    ciphertext = ''.join([c for c in ciphertext if c.isalpha()])
-    digraphs = [ciphertext[i:i+2] for i in range(0, len(ciphertext), 2)]
-    
-    plaintext = ''
-    for digraph in digraphs:
-        plaintext += decrypt_digraph(digraph, table)
+    probe.mark('key_setup')
+    ciphertext = normalize_message(ciphertext)
+    probe.mark('normalize')
+
+    if not details:
+        plaintext = ''.join(map(table.decrypt_lookup.__getitem__, iter_pairs(ciphertext)))
+        probe.mark('transform')
+        return plaintext
+
+    digraphs = list(iter_pairs(ciphertext))
+    plaintext = ''.join(map(table.decrypt_lookup.__getitem__, digraphs))
+    probe.mark('transform')
     
     return plaintext, table, digraphs
 
 
+def digraph_indices(indices):
+    """
+    Split letter positions into digraphs the way iter_digraphs does,
+    returning a flat uint8 array of even length. J must already be I.
+
+    Only double letters need sequential work: a filler goes after a double
+    when it starts a digraph, which depends on the fillers before it.
+    """
+    import numpy as np
+
+    indices = as_indices(indices)
+    inserts, fillers = [], []
+    for k in np.flatnonzero(indices[:-1] == indices[1:]).tolist():
+        if (k + len(inserts)) % 2 == 0:
+            inserts.append(k + 1)
+            fillers.append(Z_INDEX if indices[k] == X_INDEX else X_INDEX)
+
+    out = np.insert(indices, inserts, fillers) if inserts else indices
+    if len(out) % 2:
+        out = np.append(out, Z_INDEX if out[-1] == X_INDEX else X_INDEX).astype(np.uint8)
+    return out
+
+
+def _apply_indices(pairs, lookup):
+    import numpy as np
+
+    pairs = pairs.reshape(-1, 2).astype(np.intp)
+    return lookup[pairs[:, 0] * 26 + pairs[:, 1]].reshape(-1)
+
+
+def _table(key):
+    return key if isinstance(key, PlayfairTable) else generate_playfair_table(key)
+
+
+def encrypt_indices(indices, key):
+    """
+    Encrypt letter positions (0-25) and return a uint8 array. J is merged
+    into I and digraphs are split with X as in encrypt(). key is a key
+    string or a compiled PlayfairTable.
+    """
+    import numpy as np
+
+    indices = as_indices(indices)
+    indices = np.where(indices == J_INDEX, I_INDEX, indices).astype(np.uint8)
+    return _apply_indices(digraph_indices(indices), _table(key).encrypt_indices)
+
+
+def decrypt_indices(indices, key):
+    """
+    Decrypt letter positions (0-25) and return a uint8 array.
+    """
+    import numpy as np
+
+    indices = as_indices(indices)
+    if len(indices) % 2:
+        raise ValueError("Ciphertext length must be even.")
+    indices = np.where(indices == J_INDEX, I_INDEX, indices)
+    return _apply_indices(indices, _table(key).decrypt_indices)
+
+
+def encrypt_batch(messages, key):
+    """
+    Encrypt a list of messages with one key, compiling the table once.
+    """
+    lookup = generate_playfair_table(key).encrypt_lookup.__getitem__
+    return [''.join(map(lookup, iter_digraphs(normalize_message(m)))) for m in messages]
+
+
+def decrypt_batch(messages, key):
+    """
+    Decrypt a list of messages with one key, compiling the table once.
+    """
+    lookup = generate_playfair_table(key).decrypt_lookup.__getitem__
+    return [''.join(map(lookup, iter_pairs(normalize_message(m)))) for m in messages]
+
+
 def display_table(table):
     print("\nPlayfair Table:")
     for row in table:
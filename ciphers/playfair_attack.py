@@ -0,0 +1,308 @@
+"""
+PLAYFAIR CIPHERTEXT-ONLY ATTACK
+===============================
+Simulated annealing over 5x5 Playfair tables, scored with English quadgram
+log-probabilities.
+
+- Decryption goes through a precomputed lookup: for every pair of table
+  positions holding a ciphertext digraph, RESULT_POSITIONS gives the
+  positions of the plaintext letters. The rules depend only on geometry,
+  so the lookup is shared by every candidate table, and each distinct
+  ciphertext digraph is decrypted once per table however often it occurs.
+- Mutations are mostly swaps of two letters, with occasional row swaps,
+  column swaps, row/column flips and full reversals. Each is a permutation
+  of the table positions.
+- Restarts are independent annealing chains. A process runs its share of
+  them in lockstep: every step proposes one mutation per chain and scores
+  all proposals with a few array operations, so the cost of a step is
+  spread over all chains. Processes run on a pool and the best table wins.
+- The temperature is held where short ciphertexts are actually solved
+  (about 5.5 for 200 letters, scaled with the length) and falls to zero
+  over the last fifth of the run, which polishes the best tables found.
+- A process stops early once three of its chains reach the same best
+  score: independent chains rarely meet anywhere but at the solution.
+- The best table is then polished by trying every letter swap and every
+  order of its rows and columns, repeatedly. Chains sometimes settle on
+  the solution with its rows or columns out of order, which no single
+  mutation repairs without passing through worse tables.
+
+    key, plaintext, score = solve_playfair(ciphertext)
+
+Candidates are scored with a quadgram table counted from real English
+text: the one built at ciphers/data/quadgrams.npy, else the bundled
+counts (ciphers.quadgrams). The Markov approximation derived from bigrams
+is too weak to break Playfair and is never used here.
+
+The key is the 25-letter table read row by row, which is itself a valid
+Playfair key.
+"""
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import permutations
+
+import numpy as np
+
+from ciphers.playfair import decrypt, normalize_message
+from ciphers.quadgrams import corpus_quadgrams, quadgram_index
+
+ALPHABET = 'ABCDEFGHIKLMNOPQRSTUVWXYZ'
+
+# Temperature per ciphertext letter, and the share of the run it is held
+TEMPERATURE_PER_LETTER = 0.0275
+HOLD = 0.8
+
+# Proposals drawn from the random generator at a time; chains are checked
+# for agreement after each block
+BLOCK = 1024
+
+# Chains that must share the best score before a process stops early
+AGREE = 3
+
+# Table letter (0-24) -> letter position in the full A-Z alphabet
+TO_ALPHABET26 = np.array([ord(c) - ord('A') for c in ALPHABET], dtype=np.int64)
+
+
+def _result_positions():
+    pos1, pos2 = np.divmod(np.arange(625), 25)
+    row1, col1 = np.divmod(pos1, 5)
+    row2, col2 = np.divmod(pos2, 5)
+    same_row = row1 == row2
+    same_col = (col1 == col2) & ~same_row
+
+    out1 = np.where(same_row, row1*5 + (col1 - 1) % 5,
+                    np.where(same_col, ((row1 - 1) % 5)*5 + col1, row1*5 + col2))
+    out2 = np.where(same_row, row2*5 + (col2 - 1) % 5,
+                    np.where(same_col, ((row2 - 1) % 5)*5 + col2, row2*5 + col1))
+    return np.stack([out1, out2], axis=1)
+
+
+# (position of first letter * 25 + position of second) -> plaintext positions
+RESULT_POSITIONS = _result_positions()
+RESULT_FIRST = np.ascontiguousarray(RESULT_POSITIONS[:, 0])
+RESULT_SECOND = np.ascontiguousarray(RESULT_POSITIONS[:, 1])
+
+
+def _mutations():
+    """
+    Every table mutation as a permutation of the 25 positions, with the
+    probability of drawing it: letter swaps 90%, and 2% each for row swaps,
+    column swaps, row flips, column flips and full reversals.
+    """
+    identity = np.arange(25)
+    grid = identity.reshape(5, 5)
+    groups = []
+
+    swaps = []
+    for i in range(25):
+        for j in range(i + 1, 25):
+            perm = identity.copy()
+            perm[[i, j]] = perm[[j, i]]
+            swaps.append(perm)
+    groups.append((swaps, 0.90))
+
+    row_swaps, col_swaps = [], []
+    for i in range(5):
+        for j in range(i + 1, 5):
+            perm = grid.copy()
+            perm[[i, j]] = perm[[j, i]]
+            row_swaps.append(perm.ravel())
+            perm = grid.copy()
+            perm[:, [i, j]] = perm[:, [j, i]]
+            col_swaps.append(perm.ravel())
+    groups.append((row_swaps, 0.02))
+    groups.append((col_swaps, 0.02))
+    groups.append(([grid[::-1].ravel()], 0.02))
+    groups.append(([grid[:, ::-1].ravel()], 0.02))
+    groups.append(([identity[::-1]], 0.02))
+
+    perms = np.array([perm for group, _ in groups for perm in group])
+    weights = np.concatenate([np.full(len(group), share / len(group)) for group, share in groups])
+    return perms, weights / weights.sum()
+
+
+MUTATION_PERMUTATIONS, MUTATION_WEIGHTS = _mutations()
+
+
+def _neighbourhood():
+    """
+    Every letter swap and every rearrangement of the rows and columns, as
+    permutations of the 25 positions.
+    """
+    grid = np.arange(25).reshape(5, 5)
+    swaps = MUTATION_PERMUTATIONS[:300]
+    rearrangements = [grid[list(rows)][:, list(cols)].ravel()
+                      for rows in permutations(range(5)) for cols in permutations(range(5))]
+    return np.concatenate([swaps, rearrangements])
+
+
+# Permutations tried exhaustively when polishing the best table
+NEIGHBOURHOOD = _neighbourhood()
+
+
+class PlayfairAnnealer:
+    """
+    Holds one ciphertext and scores candidate tables against it.
+    """
+    def __init__(self, ciphertext, quadgrams):
+        letters = np.array([ALPHABET.index(c) for c in ciphertext], dtype=np.intp)
+        digraphs, self.sequence = np.unique(letters[0::2] * 25 + letters[1::2], return_inverse=True)
+        self.first, self.second = np.divmod(digraphs, 25)
+        self.offsets = {}
+
+        # Re-index the quadgram table by table letters (no J): 25^4 entries
+        quads = np.indices((25, 25, 25, 25)).reshape(4, -1).T
+        self.quadgrams = np.asarray(quadgrams)[quadgram_index(TO_ALPHABET26[quads])[:, 0]]
+
+    def _offsets(self, count):
+        """
+        Flat offsets of each table's row and of the ciphertext letters
+        within it, and the table positions, for a stack of count tables.
+        """
+        if count not in self.offsets:
+            rows = np.arange(count)[:, None] * 25
+            self.offsets[count] = rows, rows + self.first, rows + self.second, np.tile(np.arange(25), count)
+        return self.offsets[count]
+
+    def digraphs(self, keys):
+        """
+        Decrypt the ciphertext under a stack of tables. Returns the first
+        and second plaintext letter (0-24) of every digraph, (K, digraphs)
+        each.
+        """
+        keys = np.atleast_2d(keys)
+        rows, first, second, table_positions = self._offsets(len(keys))
+        flat = keys.ravel()
+
+        positions = np.empty_like(flat)
+        positions[(rows + keys).ravel()] = table_positions
+
+        cells = positions[first] * 25 + positions[second]
+        plain1 = flat[rows + RESULT_FIRST[cells]]
+        plain2 = flat[rows + RESULT_SECOND[cells]]
+        return plain1[:, self.sequence], plain2[:, self.sequence]
+
+    def decrypt(self, keys):
+        """
+        (K, 25) tables -> (K, length) plaintext table letters.
+        """
+        plain1, plain2 = self.digraphs(keys)
+        return np.stack([plain1, plain2], axis=2).reshape(len(plain1), -1)
+
+    def score(self, keys):
+        """
+        Quadgram log10 fitness of the decryption under each table.
+        """
+        plain1, plain2 = self.digraphs(keys)
+        pairs = plain1 * 25 + plain2
+        # Quadgrams starting on a digraph, then those starting inside one
+        index = np.concatenate([pairs[:, :-1] * 625 + pairs[:, 1:],
+                                plain2[:, :-2] * 15625 + pairs[:, 1:-1] * 25 + plain1[:, 2:]], axis=1)
+        return self.quadgrams[index].sum(axis=1, dtype=np.float64)
+
+    def polish(self, key, score):
+        """
+        Climb from key through NEIGHBOURHOOD until no permutation improves
+        it. Catches tables that differ from a better one by a rearrangement
+        of rows or columns, which single mutations reach only through
+        worse tables. Returns (score, key).
+        """
+        while True:
+            candidates = key[NEIGHBOURHOOD]
+            scores = np.concatenate([self.score(candidates[start:start + BLOCK])
+                                     for start in range(0, len(candidates), BLOCK)])
+            best = np.argmax(scores)
+            if scores[best] <= score:
+                return score, key
+            key, score = candidates[best], scores[best]
+
+    def anneal(self, chains, iterations, temperature, seed):
+        """
+        Run chains annealing chains of at most iterations proposals each
+        from random tables. Returns (score, key as a 25-letter string) of
+        the best table any chain reached.
+        """
+        rng = np.random.default_rng(seed)
+        rows = np.arange(chains)[:, None] * 25
+        temps = np.full(iterations, float(temperature))
+        hold = int(iterations * HOLD)
+        temps[hold:] = np.linspace(temperature, 0, iterations - hold)
+
+        keys = np.argsort(rng.random((chains, 25)), axis=1)
+        scores = self.score(keys)
+        best_keys, best_scores = keys.copy(), scores.copy()
+
+        for start in range(0, iterations, BLOCK):
+            count = min(BLOCK, iterations - start)
+            mutations = rng.choice(len(MUTATION_PERMUTATIONS), (count, chains), p=MUTATION_WEIGHTS)
+            thresholds = np.log(rng.random((count, chains))) * temps[start:start + count, None]
+
+            for step in range(count):
+                candidates = keys.ravel()[rows + MUTATION_PERMUTATIONS[mutations[step]]]
+                new = self.score(candidates)
+                delta = new - scores
+                # Metropolis: accept if delta >= 0 or log(u) < delta / T
+                accept = (delta >= 0) | (thresholds[step] < delta)
+                np.copyto(keys, candidates, where=accept[:, None])
+                scores = np.where(accept, new, scores)
+
+                better = scores > best_scores
+                np.copyto(best_keys, keys, where=better[:, None])
+                best_scores = np.where(better, scores, best_scores)
+
+            if np.count_nonzero(best_scores == best_scores.max()) >= AGREE:
+                break
+
+        best = np.argmax(best_scores)
+        score, key = self.polish(best_keys[best], best_scores[best])
+        return float(score), ''.join(ALPHABET[i] for i in key)
+
+
+def _anneal(ciphertext, quadgrams, chains, iterations, temperature, seed):
+    if quadgrams is None:
+        quadgrams = corpus_quadgrams()
+    return PlayfairAnnealer(ciphertext, quadgrams).anneal(chains, iterations, temperature, seed)
+
+
+def solve_playfair(ciphertext, restarts=64, iterations=250000, temperature=None,
+                   workers=None, quadgrams=None, seed=None):
+    """
+    Recover a Playfair table from ciphertext alone.
+
+    restarts independent annealing chains of up to iterations steps each
+    are split over workers processes (default: os.cpu_count()). temperature
+    defaults to a value scaled to the ciphertext length. quadgrams is a
+    flat 26^4 array of log10 probabilities counted from an English corpus;
+    if omitted, corpus_quadgrams() supplies the built or bundled table.
+    Returns (key, plaintext, score).
+
+    The search is randomized and can miss the key. On one core, most
+    200-letter ciphertexts are solved in 2-35 s. A run that never sees
+    AGREE chains agree ends after 35-50 s and returns its best table,
+    which may be wrong.
+    """
+    text = normalize_message(ciphertext)
+    if len(text) < 8 or len(text) % 2:
+        raise ValueError("The ciphertext must contain an even number of letters, at least 8.")
+    if restarts < 1 or iterations < 1:
+        raise ValueError("restarts and iterations must be positive.")
+    if quadgrams is None:
+        # Fail here rather than in every worker
+        corpus_quadgrams()
+
+    if temperature is None:
+        temperature = TEMPERATURE_PER_LETTER * len(text)
+    if seed is None:
+        seed = random.randrange(2**32)
+
+    workers = min(workers or os.cpu_count() or 1, restarts)
+    shares = [restarts // workers + (i < restarts % workers) for i in range(workers)]
+    args = [(text, quadgrams, chains, iterations, temperature, seed + i) for i, chains in enumerate(shares)]
+    if workers == 1:
+        results = [_anneal(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_anneal, *zip(*args)))
+
+    score, key = max(results)
+    return key, decrypt(text, key, details=False), score
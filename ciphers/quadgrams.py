@@ -0,0 +1,193 @@
+"""
+QUADGRAM LANGUAGE MODEL
+=======================
+English quadgram statistics stored as a flat 26^4 float32 array of log10
+probabilities (about 1.8 MB), index a*17576 + b*676 + c*26 + d for letter
+positions a, b, c, d (A=0 ... Z=25). The file is a plain .npy array and is
+memory-mapped when loaded, so opening it is instant and pages are read
+only as they are scored.
+
+Build a table from any plain-text corpus:
+
+    python -m ciphers.quadgrams ciphers/data/quadgrams.npy corpus1.txt corpus2.txt
+
+An output path ending in .npz saves the raw counts instead, as a sparse
+compressed file. ciphers/data/quadgram_counts.npz is such a file, counted
+from Newton's Opticks (public domain, about 440,000 letters), and is
+turned into a table on first use when no quadgrams.npy has been built.
+corpus_quadgrams() returns the built table or else the bundled one and is
+the default model for score() and the Playfair attack. The Markov
+approximation in ciphers.english is only used if both files are missing.
+"""
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+from ciphers.alphabet import INDEX_LOOKUP
+from ciphers.english import quadgram_log_probabilities
+
+SIZE = 26 ** 4
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", "quadgrams.npy")
+BUNDLED_PATH = os.path.join(os.path.dirname(__file__), "data", "quadgram_counts.npz")
+CHUNK_SIZE = 1 << 24
+
+
+def quadgram_index(indices):
+    """
+    Flat table index of every quadgram along the last axis:
+    (..., length) -> (..., length - 3).
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    return (indices[..., :-3] * 17576 + indices[..., 1:-2] * 676
+            + indices[..., 2:-1] * 26 + indices[..., 3:])
+
+
+def count_quadgrams(chunks):
+    """
+    Count quadgrams over an iterable of bytes chunks. Non-letters are
+    dropped, so quadgrams run across word boundaries as they do in
+    ciphertext, and across chunk boundaries.
+    """
+    counts = np.zeros(SIZE, dtype=np.int64)
+    tail = np.empty(0, dtype=np.int64)
+
+    for chunk in chunks:
+        letters = INDEX_LOOKUP[np.frombuffer(chunk, dtype=np.uint8)]
+        letters = np.concatenate([tail, letters[letters < 26]])
+        if len(letters) >= 4:
+            counts += np.bincount(quadgram_index(letters), minlength=SIZE)
+        tail = letters[-3:]
+
+    return counts
+
+
+def build_quadgrams(counts, floor=0.01):
+    """
+    Turn quadgram counts into log10 probabilities. Unseen quadgrams get
+    floor / total, as if seen a fraction of a time.
+    """
+    total = counts.sum()
+    if not total:
+        raise ValueError("The corpus contains no quadgrams.")
+    table = np.log10(np.maximum(counts, floor) / total)
+    return table.astype(np.float32)
+
+
+def _read_chunks(path):
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def count_files(paths):
+    counts = np.zeros(SIZE, dtype=np.int64)
+    for path in paths:
+        counts += count_quadgrams(_read_chunks(path))
+    return counts
+
+
+def _make_parent(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+def build_from_files(paths, out_path, floor=0.01):
+    """
+    Count every quadgram in the corpus files and save the table to out_path.
+    """
+    table = build_quadgrams(count_files(paths), floor)
+    _make_parent(out_path)
+    np.save(out_path, table)
+    return table
+
+
+def save_counts(counts, out_path):
+    """
+    Save the nonzero quadgram counts as a compressed .npz file.
+    """
+    index = np.flatnonzero(counts)
+    _make_parent(out_path)
+    np.savez_compressed(out_path, index=index.astype(np.uint32), count=counts[index].astype(np.uint32))
+
+
+def load_counts(path):
+    """
+    Read a file written by save_counts back into a flat 26^4 count array.
+    """
+    with np.load(path) as data:
+        counts = np.zeros(SIZE, dtype=np.int64)
+        counts[data['index']] = data['count']
+    return counts
+
+
+def load_quadgrams(path=DEFAULT_PATH):
+    """
+    Memory-map a quadgram table (read-only).
+    """
+    table = np.load(path, mmap_mode='r')
+    if table.shape != (SIZE,) or table.dtype != np.float32:
+        raise ValueError(f"{path} is not a flat 26^4 float32 quadgram table.")
+    return table
+
+
+@lru_cache(maxsize=1)
+def corpus_quadgrams():
+    """
+    The table at DEFAULT_PATH, else one built from the bundled counts.
+    Raises ValueError if neither file exists.
+    """
+    if os.path.exists(DEFAULT_PATH):
+        return load_quadgrams(DEFAULT_PATH)
+    if os.path.exists(BUNDLED_PATH):
+        table = build_quadgrams(load_counts(BUNDLED_PATH))
+        table.flags.writeable = False
+        return table
+    raise ValueError(f"No quadgram table at {DEFAULT_PATH} or {BUNDLED_PATH}. Build one from English text "
+                     "with 'python -m ciphers.quadgrams ciphers/data/quadgrams.npy CORPUS...' "
+                     "or pass quadgrams=.")
+
+
+@lru_cache(maxsize=1)
+def default_quadgrams():
+    """
+    corpus_quadgrams(), or the Markov approximation if there is no table.
+    """
+    try:
+        return corpus_quadgrams()
+    except ValueError:
+        return quadgram_log_probabilities()
+
+
+def score(text_indices, table=None):
+    """
+    Log10 likelihood of letter-position sequences (A=0 ... Z=25), as
+    produced by the word mappers. A 2-D array scores one candidate per row.
+    """
+    if table is None:
+        table = default_quadgrams()
+    return table[quadgram_index(text_indices)].sum(axis=-1, dtype=np.float64)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2:
+        print("usage: python -m ciphers.quadgrams OUTPUT.npy|OUTPUT.npz CORPUS [CORPUS ...]")
+        return 2
+
+    out_path, paths = argv[0], argv[1:]
+    if out_path.endswith('.npz'):
+        save_counts(count_files(paths), out_path)
+    else:
+        build_from_files(paths, out_path)
+    print(f"Wrote {out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+CIPHER REGISTRY
+===============
+Cipher modules by name, imported the first time they are asked for:
+
+    ceaser = load('caesar')
+    ceaser.calculate_cipher("hello", 3)
+
+Caesar, Affine and Playfair import without NumPy, so a session that never
+touches Hill never loads it. Each loader is a plain import statement
+rather than an importlib call on a string, so PyInstaller's import
+scanner still finds every module and bundles it in the frozen binary.
+"""
+
+
+def _caesar():
+    from ciphers import ceaser
+    return ceaser
+
+
+def _affine():
+    from ciphers import affine
+    return affine
+
+
+def _playfair():
+    from ciphers import playfair
+    return playfair
+
+
+def _hill():
+    from ciphers import hill
+    return hill
+
+
+def _hill_attack():
+    from ciphers import hill_attack
+    return hill_attack
+
+
+LOADERS = {
+    'caesar': _caesar,
+    'affine': _affine,
+    'playfair': _playfair,
+    'hill': _hill,
+    'hill_attack': _hill_attack,
+}
+
+
+def load(name):
+    """
+    Import and return the module registered under name.
+    """
+    try:
+        loader = LOADERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown cipher '{name}'. Choose from: {', '.join(LOADERS)}") from None
+    return loader()
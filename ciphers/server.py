@@ -0,0 +1,300 @@
+"""
+CIPHER SERVICE
+==============
+A long-running asyncio server so other processes can use the ciphers
+without paying interpreter and NumPy start-up on every call.
+
+    python -m ciphers.server --port 8765
+    python -m ciphers.server --unix /tmp/pycipher.sock
+
+The protocol is newline-delimited JSON over TCP or a Unix socket. Each
+request is one object per line and gets one response line; a client may
+pipeline many requests on one connection.
+
+    {"id": 1, "op": "encrypt", "cipher": "affine", "key": [5, 8], "text": "attack at dawn"}
+    {"id": 1, "ok": true, "result": "izzisgizxiov"}
+
+Operations:
+
+- encrypt / decrypt: cipher, key, text, plus include_non_alpha for Affine
+- attack: cipher and text (the ciphertext)
+    - caesar / affine: frequency analysis, top_k candidates
+    - hill: known_plaintext given -> attack_hill, else search_hill_keys
+    - playfair: solve_playfair with the corpus quadgram table (ciphers.quadgrams)
+- stats: request count, requests/sec and p50/p99 latency per operation
+- metrics: per-stage timings and counters from ciphers.metrics, as JSON
+  or, with "format": "prometheus", as Prometheus text. Start the server
+  with --metrics to record them; requests run on the pool are not counted.
+
+Fields other than those listed are rejected, as are options of the wrong
+type. Every failure, including a crashed pool worker, is answered with
+{"ok": false, "error": ...} on the same connection.
+
+Keys use the same form as compile_key and are kept warm in its cache.
+Attacks, and texts longer than inline_limit characters, run on a process
+pool so the event loop keeps serving small requests.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from ciphers import metrics
+from ciphers.keys import compile_key, key_cache_info
+
+DEFAULT_PORT = 8765
+INLINE_LIMIT = 64 * 1024
+LATENCY_WINDOW = 100000
+OPERATIONS = ('encrypt', 'decrypt', 'attack', 'stats', 'metrics')
+
+# Extra request fields each op accepts, with their types
+OPTIONS = {
+    'encrypt': {'include_non_alpha': bool},
+    'decrypt': {'include_non_alpha': bool},
+    'attack': {'known_plaintext': str, 'key_size': int, 'top_k': int, 'restarts': int, 'iterations': int},
+}
+
+
+def _transform(op, cipher, key, text, options):
+    probe = metrics.start(cipher, op, len(text))
+    compiled = compile_key(cipher, key)
+    probe.mark('key_setup')
+
+    transform = compiled.decrypt if op == 'decrypt' else compiled.encrypt
+    result = transform(text, **options)
+    probe.mark('transform')
+    return result
+
+
+def _attack(cipher, text, options):
+    if cipher in ('caesar', 'affine'):
+        from ciphers.frequency_attack import crack_affine, crack_caesar
+        crack = crack_caesar if cipher == 'caesar' else crack_affine
+        return crack(text, top_k=options.get('top_k', 5))
+
+    if cipher == 'hill':
+        from ciphers.hill_attack import attack_hill, search_hill_keys
+        if 'known_plaintext' in options:
+            return attack_hill(options['known_plaintext'], text, options.get('key_size'))
+        return search_hill_keys(text, top_k=options.get('top_k', 5))
+
+    if cipher == 'playfair':
+        from ciphers.playfair_attack import solve_playfair
+        search = {name: options[name] for name in ('restarts', 'iterations') if name in options}
+        key, plaintext, score = solve_playfair(text, workers=1, **search)
+        return {'key': key, 'plaintext': plaintext, 'score': score}
+
+    raise ValueError(f"No attack for cipher '{cipher}'.")
+
+
+def run_job(op, cipher, key, text, options):
+    """
+    Run one request synchronously. Also the entry point in pool workers.
+    """
+    if op == 'attack':
+        return _attack(cipher, text, options)
+    return _transform(op, cipher, key, text, options)
+
+
+def _options(op, request):
+    """
+    Collect and type-check the extra fields of a request.
+    """
+    allowed = OPTIONS[op]
+    options = {}
+    for name, value in request.items():
+        if name in ('id', 'op', 'cipher', 'key', 'text'):
+            continue
+        if name not in allowed:
+            raise ValueError(f"Unknown option '{name}' for op '{op}'.")
+        kind = allowed[name]
+        # bool is an int subclass; only accept it where a bool is expected
+        if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+            raise ValueError(f"Option '{name}' must be of type {kind.__name__}.")
+        options[name] = value
+    return options
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class CipherServer:
+    """
+    Request handling and statistics, independent of the transport.
+    """
+    def __init__(self, workers=None, inline_limit=INLINE_LIMIT):
+        self.workers = workers or os.cpu_count() or 1
+        self.inline_limit = inline_limit
+        self.pool = None
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.errors = 0
+        self.latencies = {op: deque(maxlen=LATENCY_WINDOW) for op in OPERATIONS}
+
+    def _executor(self):
+        if self.pool is None:
+            # Forked workers would inherit every open client socket and keep
+            # connections the server closes open; start them from a forkserver
+            context = None
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context('forkserver')
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self.pool
+
+    async def handle(self, request):
+        """
+        Answer one decoded request with a response dict.
+        """
+        start = time.perf_counter()
+        op = request.get('op') if isinstance(request, dict) else None
+        response = {'id': request.get('id')} if isinstance(request, dict) else {'id': None}
+
+        try:
+            if op not in OPERATIONS:
+                raise ValueError(f"Unknown op '{op}'. Choose from: {', '.join(OPERATIONS)}")
+            if op == 'stats':
+                result = self.stats()
+            elif op == 'metrics':
+                result = self.metrics(request.get('format', 'json'))
+            else:
+                result = await self._run(op, request)
+            response.update(ok=True, result=result)
+        except Exception as e:
+            # Every failure is answered, so requests pipelined behind it survive
+            self.errors += 1
+            response.update(ok=False, error=f"{type(e).__name__}: {e}")
+
+        self.requests += 1
+        if op in self.latencies:
+            self.latencies[op].append(time.perf_counter() - start)
+        return response
+
+    async def _run(self, op, request):
+        cipher = request.get('cipher')
+        key = request.get('key')
+        text = request.get('text')
+        if not isinstance(text, str):
+            raise ValueError("'text' must be a string.")
+        options = _options(op, request)
+
+        if op != 'attack' and len(text) <= self.inline_limit:
+            return run_job(op, cipher, key, text, options)
+
+        if op != 'attack':
+            # Validate the key here so bad keys fail fast without a round trip
+            compile_key(cipher, key)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor(), run_job, op, cipher, key, text, options)
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next request
+            self.close()
+            raise
+
+    def stats(self):
+        elapsed = time.perf_counter() - self.started
+        latency = {}
+        for op, samples in self.latencies.items():
+            if samples:
+                ordered = sorted(samples)
+                latency[op] = {
+                    'count': len(ordered),
+                    'p50_ms': _percentile(ordered, 0.50) * 1000,
+                    'p99_ms': _percentile(ordered, 0.99) * 1000,
+                }
+        cache = key_cache_info()
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'uptime_s': elapsed,
+            'requests_per_s': self.requests / elapsed if elapsed else 0.0,
+            'latency': latency,
+            'key_cache': {'hits': cache.hits, 'misses': cache.misses, 'size': cache.currsize},
+        }
+
+    def metrics(self, form='json'):
+        recorder = metrics.get_recorder()
+        if recorder is None:
+            raise ValueError("Metrics are disabled. Start the server with --metrics.")
+        if form == 'prometheus':
+            return recorder.to_prometheus()
+        if form == 'json':
+            return recorder.snapshot()
+        raise ValueError(f"Unknown metrics format '{form}'. Choose from: json, prometheus")
+
+    async def client_connected(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {'id': None, 'ok': False, 'error': "Malformed JSON request."}
+                else:
+                    response = await self.handle(request)
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=DEFAULT_PORT, unix_path=None):
+        """
+        Start listening and return the asyncio server.
+        """
+        limit = 2 ** 31 - 1
+        if unix_path:
+            return await asyncio.start_unix_server(self.client_connected, path=unix_path, limit=limit)
+        return await asyncio.start_server(self.client_connected, host, port, limit=limit)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+
+async def serve(host='127.0.0.1', port=DEFAULT_PORT, unix_path=None, workers=None):
+    service = CipherServer(workers)
+    server = await service.start(host, port, unix_path)
+    where = unix_path or f"{host}:{port}"
+    print(f"PyCipher service listening on {where}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PyCipher encryption service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="Listen on a Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--metrics", action="store_true", help="Record per-stage timings for the metrics op")
+    args = parser.parse_args(argv)
+
+    if args.metrics:
+        metrics.enable_metrics()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+STREAMING ENCRYPTION
+====================
+Encrypt or decrypt arbitrarily large inputs in fixed-size chunks so memory
+use stays flat regardless of input size.
+
+    with open("in.txt") as reader, open("out.txt", "w") as writer:
+        encrypt_stream(reader, writer, "hill", "GYBNQKURP")
+
+reader is any object with a read(size) method returning str, and writer
+any object with a write(str) method. Keys take the forms described in
+ciphers.keys; pass include_non_alpha=True to keep non-letters with Affine.
+
+State that spans chunk boundaries is carried between chunks: Hill blocks
+that are not yet complete, and the trailing Playfair letter that may still
+form a digraph (or a double-letter split) with the next chunk. The result
+is identical to running the whole input through the cipher at once, with
+Hill plaintext padded with X to a full block at the end.
+
+Only the Hill transformer imports ciphers.hill and NumPy.
+"""
+from ciphers import metrics, playfair
+from ciphers.alphabet import to_indices
+from ciphers.keys import compile_key
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class _Substitution:
+    """
+    Stateless per-character transform: each chunk is handled on its own.
+    """
+    def __init__(self, func):
+        self.func = func
+
+    def update(self, chunk):
+        return self.func(chunk)
+
+    def finish(self):
+        return ''
+
+
+class _HillBlocks:
+    """
+    Buffers letters until complete n-letter blocks are available.
+    """
+    def __init__(self, key, decrypt):
+        import numpy as np
+
+        compiled = compile_key('hill', key)
+        self.key = compiled.key
+        self.matrix = compiled.inverse if decrypt else compiled.matrix
+        self.block = compiled.block
+        self.decrypt = decrypt
+        self.pending = np.empty(0, dtype=np.uint8)
+
+    def _transform(self, letters):
+        """
+        Transform whole blocks; each encrypted chunk is one audit entry.
+        """
+        import numpy as np
+        from ciphers import hill
+
+        if not len(letters):
+            return ''
+        result = hill.hill_transform(letters, self.matrix).astype(np.uint8)
+        if not self.decrypt:
+            hill.record_audit(letters, self.key, result)
+        return hill.hill_indices_to_text(result)
+
+    def update(self, chunk):
+        import numpy as np
+        from ciphers import hill
+
+        letters = np.concatenate([self.pending, to_indices(chunk, hill.SPECIAL_CHARS)])
+        usable = len(letters) - len(letters) % self.block
+        self.pending = letters[usable:]
+        return self._transform(letters[:usable])
+
+    def finish(self):
+        import numpy as np
+        from ciphers import hill
+
+        if not len(self.pending):
+            return ''
+        if self.decrypt:
+            raise ValueError(f"Ciphertext length must be a multiple of {self.block}.")
+        padded = np.concatenate([self.pending, [hill.PAD_INDEX] * (self.block - len(self.pending))])
+        self.pending = self.pending[:0]
+        return self._transform(padded)
+
+
+class _PlayfairDigraphs:
+    """
+    Carries the unpaired trailing letter of each chunk into the next one.
+    """
+    def __init__(self, key, decrypt):
+        self.table = compile_key('playfair', key).table
+        self.decrypt = decrypt
+        self.pending = ''
+
+    def _digraphs(self, message, final):
+        if self.decrypt:
+            usable = len(message) - len(message) % 2
+            if final and usable != len(message):
+                raise ValueError("Ciphertext length must be even.")
+            return playfair.iter_pairs(message[:usable]), message[usable:]
+        return playfair.split_digraphs(message, final)
+
+    def _transform(self, final):
+        digraphs, self.pending = self._digraphs(self.pending, final)
+        lookup = self.table.decrypt_lookup if self.decrypt else self.table.encrypt_lookup
+        return ''.join(map(lookup.__getitem__, digraphs))
+
+    def update(self, chunk):
+        self.pending += playfair.normalize_message(chunk)
+        return self._transform(final=False)
+
+    def finish(self):
+        return self._transform(final=True)
+
+
+# Ciphers whose output for a chunk depends on the chunks around it
+STATEFUL = {
+    'playfair': _PlayfairDigraphs,
+    'hill': _HillBlocks,
+}
+
+
+def make_transformer(cipher, key, decrypt=False, **options):
+    """
+    Build the chunk transformer for a cipher. The returned object has
+    update(chunk) -> str and finish() -> str methods.
+    """
+    if cipher in STATEFUL:
+        return STATEFUL[cipher](key, decrypt, **options)
+    compiled = compile_key(cipher, key)
+    transform = compiled.decrypt if decrypt else compiled.encrypt
+    return _Substitution(lambda text: transform(text, **options))
+
+
+def _pump(reader, writer, cipher, key, decrypt, chunk_size, options):
+    probe = metrics.start(cipher)
+    transformer = make_transformer(cipher, key, decrypt=decrypt, **options)
+    probe.mark('key_setup', 0)
+
+    read = written = 0
+    while True:
+        chunk = reader.read(chunk_size)
+        probe.mark('input', len(chunk))
+        if not chunk:
+            break
+        read += len(chunk)
+        out = transformer.update(chunk)
+        probe.mark('transform', len(chunk))
+        if out:
+            writer.write(out)
+            written += len(out)
+            probe.mark('output', len(out))
+
+    out = transformer.finish()
+    probe.mark('transform', 0)
+    if out:
+        writer.write(out)
+        written += len(out)
+        probe.mark('output', len(out))
+
+    metrics.count(cipher, 'decrypt' if decrypt else 'encrypt', read)
+    return written
+
+
+def encrypt_stream(reader, writer, cipher, key, chunk_size=DEFAULT_CHUNK_SIZE, **options):
+    """
+    Encrypt everything readable from reader into writer, chunk_size
+    characters at a time. Returns the number of characters written.
+    """
+    return _pump(reader, writer, cipher, key, False, chunk_size, options)
+
+
+def decrypt_stream(reader, writer, cipher, key, chunk_size=DEFAULT_CHUNK_SIZE, **options):
+    """
+    Decrypt everything readable from reader into writer, chunk_size
+    characters at a time. Returns the number of characters written.
+    """
+    return _pump(reader, writer, cipher, key, True, chunk_size, options)
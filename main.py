@@ -1,8 +1,8 @@
-from ciphers.ceaser import (calculate_cipher, retrieve_plaintext)
-from ciphers.hill import (hill_word_mapper, generate_ciphertext, hill_retrieve_plaintext)
-from ciphers.hill_attack import attack_hill
-from ciphers.affine import affine_encrypt, affine_decrypt
-from ciphers.playfair import encrypt as playfair_encrypt, decrypt as playfair_decrypt
+import os
+import sys
+
+from ciphers import metrics
+from ciphers.registry import load
 
 from ui.console import (
     show_menu,
@@ -13,7 +13,38 @@ from ui.console import (
     show_result
 )
 
-def main():
+
+def _app_dir():
+    """
+    The directory holding hill/bank.txt. A PyInstaller onefile build runs
+    from a temporary extraction directory that is deleted on exit, so the
+    frozen binary keeps its bank next to the executable instead.
+    """
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+BANK_PATH = os.environ.get("PYCIPHER_BANK") or os.path.join(_app_dir(), "hill", "bank.txt")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    metrics_path = os.environ.get(metrics.ENV_VAR)
+    recorder = metrics.enable_metrics() if metrics_path else None
+    try:
+        if argv:
+            # Arguments given: run the non-interactive CLI instead of the menu
+            from ui.cli import main as cli_main
+            return cli_main(argv)
+
+        run()
+    finally:
+        if recorder is not None:
+            recorder.dump(metrics_path)
+
+
+def run():
     show_menu()
     choice = get_choice()
     
@@ -25,76 +56,92 @@ def main():
         return
 
     if choice == "1": # Caesar
+        ceaser = load("caesar")
         
         if mode== "E":
             text= get_text("Enter the plaintext: ")
             shift= int(get_text("Enter Shift (Default 3): "))
-            result= calculate_cipher(text, shift)
+            result= ceaser.calculate_cipher(text, shift)
 
         else:
             text= get_text("Enter the ciphertext: ")
             shift= int(get_text("Enter Shift (Default 3): "))
-            result= retrieve_plaintext(text, shift)
+            result= ceaser.retrieve_plaintext(text, shift)
     
         show_result(result)
 
     elif choice == "2":  # Affine Cipher
+        affine = load("affine")
 
         if mode == "E":
             text = get_text("Enter the plaintext: ")
             a = int(get_key("Enter key 'a' (coprime with 26): "))
             b = int(get_key("Enter key 'b' (0-25): "))
-            result = affine_encrypt(text, a, b, include_non_alpha=True)
+            result = affine.affine_encrypt(text, a, b, include_non_alpha=True)
 
         else:
             text = get_text("Enter the ciphertext: ")
             a = int(get_key("Enter key 'a' (coprime with 26): "))
             b = int(get_key("Enter key 'b' (0-25): "))
-            result = affine_decrypt(text, a, b, include_non_alpha=True)
+            result = affine.affine_decrypt(text, a, b, include_non_alpha=True)
 
         show_result(result)   
 
     elif choice == "3":  # Playfair Cipher
+        playfair = load("playfair")
 
         if mode == "E":
             text = get_text("Enter the plaintext: ")
             key = get_key("Enter the key: ")
-            result, _, _ = playfair_encrypt(text, key)
+            result = playfair.encrypt(text, key, details=False)
 
         else:
             text = get_text("Enter the ciphertext: ")
             key = get_key("Enter the key: ")
-            result, _, _ = playfair_decrypt(text, key)
+            result = playfair.decrypt(text, key, details=False)
 
         show_result(result)     
 
     elif choice == "4": # Hill
+        hill = load("hill")
 
         if mode=="E":
             text = get_text("Enter the plaintext: ")
-            key = get_key("Enter the 4 letter key: ")
-
-            conv_text= hill_word_mapper(text,"w2n", pad=True)
-            result= generate_ciphertext(conv_text,key)
+            key = get_key("Enter the key (4, 9, 16, ... letters): ")
+            block = hill.generate_key(key).shape[0]
+
+            conv_text= hill.hill_word_mapper(text,"w2n", pad=True, block=block)
+
+            # Only Hill encryption is banked, so the audit thread starts here
+            from ciphers.audit import QueuedFileAuditSink, set_audit_sink
+            os.makedirs(os.path.dirname(BANK_PATH) or '.', exist_ok=True)
+            sink = QueuedFileAuditSink(BANK_PATH)
+            previous = set_audit_sink(sink)
+            try:
+                result= hill.generate_ciphertext(conv_text,key)
+            finally:
+                set_audit_sink(previous)
+                sink.close()
 
         else:
             text = get_text("Enter the ciphertext: ")
-            key = get_key("Enter the 4 letter key: ")
-            conv_text= hill_word_mapper(text, "w2n", pad=False)
+            key = get_key("Enter the key (4, 9, 16, ... letters): ")
+            conv_text= hill.hill_word_mapper(text, "w2n", pad=False)
 
-            result = hill_retrieve_plaintext(conv_text,key)
+            result = hill.hill_retrieve_plaintext(conv_text,key)
 
         show_result(result)
     
     elif choice == "5": # Hill Attack
+        hill_attack = load("hill_attack")
 
         plain= get_text("Enter Known Plaintext: ")
         cipher= get_text("Enter Known Ciphertext: ")
         
-        result= attack_hill(plain,cipher)
+        result= hill_attack.attack_hill(plain,cipher)
 
         show_result(result)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Every Hill encryption path reports what it encrypted to the audit sink.
+"""
+import io
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+from ciphers import hill, parallel
+from ciphers.audit import AuditSink, set_audit_sink
+from ciphers.batch import encrypt_batch
+from ciphers.keys import compile_key
+from ciphers.stream import decrypt_stream, encrypt_stream
+
+KEY = "GYBNQKURP"
+TEXT = "the quick brown fox jumps over the lazy dog " * 40
+
+
+class RecordingSink(AuditSink):
+    enabled = True
+
+    def __init__(self):
+        self.entries = []
+
+    def record(self, plaintext, key, ciphertext):
+        self.entries.append((plaintext, key, ciphertext))
+
+
+class AuditTests(unittest.TestCase):
+    def setUp(self):
+        self.sink = RecordingSink()
+        self.previous = set_audit_sink(self.sink)
+        self.addCleanup(set_audit_sink, self.previous)
+        self.plaintext = hill.hill_indices_to_text(hill.hill_word_mapper(TEXT, 'w2n', pad=True, block=3))
+        self.ciphertext = compile_key('hill', KEY).encrypt(TEXT)
+        del self.sink.entries[:]
+
+    def assertRecorded(self, count=None):
+        entries = self.sink.entries
+        if count is not None:
+            self.assertEqual(len(entries), count)
+        self.assertEqual(''.join(plain for plain, _, _ in entries), self.plaintext)
+        self.assertEqual({key for _, key, _ in entries}, {KEY})
+        self.assertEqual(''.join(cipher for _, _, cipher in entries), self.ciphertext)
+
+    def test_single_call(self):
+        compile_key('hill', KEY).encrypt(TEXT)
+        self.assertRecorded(1)
+
+        del self.sink.entries[:]
+        hill.generate_ciphertext(hill.hill_word_mapper(TEXT, 'w2n', pad=True, block=3), KEY)
+        self.assertRecorded(1)
+
+    def test_batch(self):
+        encrypt_batch([TEXT[:100], TEXT[100:]], 'hill', KEY)
+        self.assertEqual(len(self.sink.entries), 2)
+        self.assertEqual(self.sink.entries[0][2], compile_key('hill', KEY).encrypt(TEXT[:100]))
+
+    def test_stream(self):
+        encrypt_stream(io.StringIO(TEXT), io.StringIO(), 'hill', KEY, chunk_size=100)
+        self.assertRecorded()
+        self.assertGreater(len(self.sink.entries), 1)
+
+    def test_parallel(self):
+        parallel.parallel_encrypt(TEXT, 'hill', KEY, workers=1)
+        self.assertRecorded(1)
+
+        del self.sink.entries[:]
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            with mock.patch.object(parallel, 'MIN_SHARD_SIZE', 300):
+                parallel.parallel_encrypt(TEXT, 'hill', KEY, workers=2, executor=executor)
+        self.assertRecorded(1)
+
+    def test_decryption_is_not_recorded(self):
+        compile_key('hill', KEY).decrypt(self.ciphertext)
+        parallel.parallel_decrypt(self.ciphertext, 'hill', KEY, workers=1)
+        decrypt_stream(io.StringIO(self.ciphertext), io.StringIO(), 'hill', KEY, chunk_size=100)
+        self.assertEqual(self.sink.entries, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
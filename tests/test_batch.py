@@ -0,0 +1,56 @@
+"""
+Batch APIs: one vectorized call must match encrypting each message alone.
+"""
+import random
+import unittest
+
+from ciphers.batch import decrypt_batch, encrypt_batch
+from ciphers.keys import compile_key
+
+KEYS = [
+    ('caesar', 3, {}),
+    ('affine', (5, 8), {}),
+    ('affine', (7, 2), {'include_non_alpha': True}),
+    ('playfair', "MONARCHY", {}),
+    ('hill', "HILL", {}),
+    ('hill', "GYBNQKURP", {}),
+]
+
+CHARACTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz    .,!?\n"
+
+
+class BatchTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.messages = [''.join(rng.choice(CHARACTERS) for _ in range(rng.randint(1, 30))) for _ in range(200)]
+        # Playfair needs at least one letter per message
+        self.messages = [m for m in self.messages if any(c.isalpha() for c in m)]
+        # Upper-cases to ASCII letters, like the single-message mappers accept
+        self.messages += ["ſtraße"]
+
+    def test_matches_per_message(self):
+        for cipher, key, options in KEYS:
+            compiled = compile_key(cipher, key)
+            expected = [compiled.encrypt(m, **options) for m in self.messages]
+            with self.subTest(cipher=cipher, key=key):
+                ciphertexts = encrypt_batch(self.messages, cipher, key, **options)
+                self.assertEqual(ciphertexts, expected)
+                self.assertEqual(decrypt_batch(ciphertexts, cipher, key, **options),
+                                 [compiled.decrypt(c, **options) for c in expected])
+
+    def test_empty_batch(self):
+        for cipher, key, options in KEYS:
+            with self.subTest(cipher=cipher):
+                self.assertEqual(encrypt_batch([], cipher, key, **options), [])
+
+    def test_rejects_bad_input(self):
+        # Caesar drops punctuation but not digits; Hill drops both
+        for cipher, key, messages in (('caesar', 3, ["ab", "c1"]), ('hill', "HILL", ["ab", "cé"])):
+            with self.subTest(cipher=cipher):
+                with self.assertRaises(KeyError):
+                    encrypt_batch(messages, cipher, key)
+        with self.assertRaises(ValueError):
+            decrypt_batch(["ABC"], 'hill', "HILL")
+
+if __name__ == '__main__':
+    unittest.main()
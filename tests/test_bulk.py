@@ -0,0 +1,62 @@
+"""
+Memory-mapped bulk mode against the string ciphers, and outputs that name
+their own input.
+"""
+import os
+import tempfile
+import unittest
+
+from ciphers import affine, bulk, ceaser
+
+TEXT = "Attack at dawn, then regroup at the old mill.\nMeet me there!\n" * 50
+
+
+class BulkFileTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.src = os.path.join(tmp.name, 'plain.txt')
+        self.dst = os.path.join(tmp.name, 'out.txt')
+        self.write(self.src, TEXT)
+
+    def write(self, path, text):
+        with open(path, 'w', encoding='ascii', newline='') as f:
+            f.write(text)
+
+    def read(self, path):
+        with open(path, encoding='ascii', newline='') as f:
+            return f.read()
+
+    def test_matches_string_ciphers(self):
+        # A small window splits the file across many windows
+        cases = [
+            ('caesar', 3, False, ceaser.calculate_cipher(TEXT, 3)),
+            ('affine', (5, 8), False, affine.affine_encrypt(TEXT, 5, 8)),
+            ('affine', (5, 8), True, affine.affine_encrypt(TEXT, 5, 8, include_non_alpha=True)),
+        ]
+        for cipher, key, include_non_alpha, expected in cases:
+            with self.subTest(cipher=cipher, include_non_alpha=include_non_alpha):
+                size = bulk.encrypt_file(self.src, self.dst, cipher, key, include_non_alpha, window=37)
+                self.assertEqual(self.read(self.dst), expected)
+                self.assertEqual(size, len(expected))
+
+    def test_decrypt_in_place(self):
+        bulk.encrypt_file(self.src, None, 'affine', (5, 8), include_non_alpha=True, window=37)
+        bulk.decrypt_file(self.src, None, 'affine', (5, 8), include_non_alpha=True, window=37)
+        self.assertEqual(self.read(self.src), TEXT)
+
+    def test_output_is_input(self):
+        same = os.path.join(os.path.dirname(self.src), '.', 'plain.txt')
+        bulk.encrypt_file(self.src, same, 'affine', (5, 8), include_non_alpha=True)
+        self.assertEqual(self.read(self.src), affine.affine_encrypt(TEXT, 5, 8, include_non_alpha=True))
+
+        self.write(self.src, TEXT)
+        for cipher, key in (('caesar', 3), ('affine', (5, 8))):
+            with self.subTest(cipher=cipher):
+                with self.assertRaises(ValueError):
+                    bulk.encrypt_file(self.src, self.src, cipher, key)
+                self.assertEqual(self.read(self.src), TEXT)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+The non-interactive CLI on real files: round trips, and commands that would
+overwrite their own input.
+"""
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from ui.cli import main
+
+
+def run_cli(*argv):
+    stderr = io.StringIO()
+    with contextlib.redirect_stderr(stderr):
+        status = main(list(argv))
+    return status, stderr.getvalue()
+
+
+class CliTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.inputs = os.path.join(self.root, 'in')
+        os.makedirs(os.path.join(self.inputs, 'sub'))
+        self.files = {'a.txt': "Attack at dawn!\n", os.path.join('sub', 'b.txt'): "Hello, world.\r\n"}
+        for name, text in self.files.items():
+            with open(os.path.join(self.inputs, name), 'w', encoding='utf-8', newline='') as f:
+                f.write(text)
+
+    def read(self, *parts):
+        with open(os.path.join(*parts), encoding='utf-8', newline='') as f:
+            return f.read()
+
+    def test_directory_round_trip(self):
+        encrypted = os.path.join(self.root, 'enc')
+        decrypted = os.path.join(self.root, 'dec')
+        key = ['-c', 'affine', '-k', '5,8', '--include-non-alpha']
+        self.assertEqual(run_cli('encrypt', *key, '-i', self.inputs, '-o', encrypted)[0], 0)
+        self.assertEqual(run_cli('decrypt', *key, '-i', encrypted, '-o', decrypted)[0], 0)
+        for name, text in self.files.items():
+            with self.subTest(name=name):
+                self.assertNotEqual(self.read(encrypted, name), text.replace('\r\n', '\n'))
+                self.assertEqual(self.read(decrypted, name), text.replace('\r\n', '\n'))
+
+    def test_output_is_input(self):
+        path = os.path.join(self.inputs, 'a.txt')
+        status, error = run_cli('encrypt', '-c', 'caesar', '-k', '3', '-i', path, '-o', path)
+        self.assertEqual(status, 1)
+        self.assertIn("also an input", error)
+        self.assertEqual(self.read(path), self.files['a.txt'])
+
+    def test_output_directory_inside_input(self):
+        for output in (self.inputs, os.path.join(self.inputs, 'sub')):
+            with self.subTest(output=output):
+                status, error = run_cli('encrypt', '-c', 'caesar', '-k', '3', '-i', self.inputs, '-o', output)
+                self.assertEqual(status, 1)
+                self.assertIn("inside the input directory", error)
+        for name, text in self.files.items():
+            self.assertEqual(self.read(self.inputs, name), text)
+
+    def test_glob_into_its_own_directory(self):
+        pattern = os.path.join(self.inputs, '*.txt')
+        status, error = run_cli('encrypt', '-c', 'caesar', '-k', '3', '-i', pattern, self.inputs + '/sub/*.txt',
+                                '-o', self.inputs)
+        self.assertEqual(status, 1)
+        self.assertEqual(self.read(self.inputs, 'a.txt'), self.files['a.txt'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+"""
+Frequency analysis against Caesar and Affine ciphertexts of plain English.
+"""
+import unittest
+
+from ciphers.affine import get_valid_a_values
+from ciphers.frequency_attack import crack_affine, crack_caesar
+from ciphers.keys import compile_key
+
+TEXT = (
+    "The analysts met early on Tuesday to review the quarterly figures. Most of the numbers were "
+    "better than expected, although shipping costs had risen sharply since the spring and several "
+    "suppliers were still waiting to be paid."
+)
+
+
+class FrequencyAttackTests(unittest.TestCase):
+    def test_cracks_every_caesar_shift(self):
+        for shift in range(26):
+            with self.subTest(shift=shift):
+                ranked = crack_caesar(compile_key('caesar', shift).encrypt(TEXT), top_k=3)
+                self.assertEqual(len(ranked), 3)
+                self.assertEqual(ranked[0][0], shift)
+                self.assertGreater(ranked[0][1], ranked[1][1])
+
+    def test_cracks_affine_keys(self):
+        for a in get_valid_a_values():
+            for b in (0, 8, 25):
+                with self.subTest(a=a, b=b):
+                    ranked = crack_affine(compile_key('affine', (a, b)).encrypt(TEXT), top_k=1)
+                    self.assertEqual(ranked[0][0], (a, b))
+
+    def test_ranks_every_key(self):
+        ciphertext = compile_key('affine', (5, 8)).encrypt(TEXT)
+        ranked = crack_affine(ciphertext)
+        self.assertEqual(len(ranked), 12 * 26)
+        scores = [score for _, score in ranked]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(len(crack_caesar(ciphertext)), 26)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Modular inversion and round trips of n x n Hill key matrices.
+"""
+import random
+import unittest
+from fractions import Fraction
+from math import gcd
+
+import numpy as np
+
+from ciphers.hill import decrypt_indices, encrypt_indices, key_schedule, matrix_mod_inverse
+
+
+def determinant(matrix):
+    """
+    Exact determinant by Fraction elimination.
+    """
+    rows = [[Fraction(int(x)) for x in row] for row in matrix]
+    n = len(rows)
+    det = Fraction(1)
+    for col in range(n):
+        pivot = next((r for r in range(col, n) if rows[r][col]), None)
+        if pivot is None:
+            return 0
+        if pivot != col:
+            rows[col], rows[pivot] = rows[pivot], rows[col]
+            det = -det
+        det *= rows[col][col]
+        for r in range(col + 1, n):
+            factor = rows[r][col] / rows[col][col]
+            rows[r] = [x - factor * y for x, y in zip(rows[r], rows[col])]
+    return int(det)
+
+
+class MatrixInverseTests(unittest.TestCase):
+    def test_inverse_agrees_with_determinant(self):
+        rng = random.Random(0)
+        for n in range(2, 9):
+            invertible = 0
+            while invertible < 5:
+                matrix = np.array([[rng.randrange(26) for _ in range(n)] for _ in range(n)])
+                with self.subTest(n=n, matrix=matrix.tolist()):
+                    if gcd(determinant(matrix) % 26, 26) != 1:
+                        with self.assertRaises(ValueError):
+                            matrix_mod_inverse(matrix)
+                        continue
+                    inverse = matrix_mod_inverse(matrix)
+                    np.testing.assert_array_equal(matrix @ inverse % 26, np.eye(n, dtype=int))
+                    np.testing.assert_array_equal(inverse @ matrix % 26, np.eye(n, dtype=int))
+                    invertible += 1
+
+
+class HillKeyTests(unittest.TestCase):
+    def test_round_trip(self):
+        rng = np.random.default_rng(0)
+        for key in ("HILL", "GYBNQKURP", "SPQMSBPHXZMNVFLR"):
+            n = key_schedule(key)[0].shape[0]
+            for length in range(1, 3 * n):
+                plain = rng.integers(0, 26, length).astype(np.uint8)
+                with self.subTest(key=key, length=length):
+                    cipher = encrypt_indices(plain, key)
+                    self.assertEqual(len(cipher) % n, 0)
+                    np.testing.assert_array_equal(decrypt_indices(cipher, key)[:length], plain)
+
+    def test_rejects_bad_keys(self):
+        # ABCD has determinant -2, which shares a factor with 26
+        for key in ("", "ABC", "ABCD"):
+            with self.subTest(key=key):
+                with self.assertRaises(ValueError):
+                    key_schedule(key)
+
+
+if __name__ == '__main__':
+    unittest.main()
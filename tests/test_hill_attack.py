@@ -0,0 +1,95 @@
+"""
+Hill known-plaintext attack on long cribs, including inconsistent ones,
+and the ciphertext-only 2x2 key search on English.
+"""
+import random
+import unittest
+
+import numpy as np
+
+from ciphers.alphabet import from_indices
+from ciphers.hill import encrypt_indices, key_schedule
+from ciphers.hill_attack import attack_hill, search_hill_keys
+from ciphers.keys import compile_key
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+ENGLISH = (
+    "The analysts met early on Tuesday to review the quarterly figures. Most of the numbers were "
+    "better than expected, although shipping costs had risen sharply since the spring and several "
+    "suppliers were still waiting to be paid. After a long discussion the committee agreed to delay "
+    "the new warehouse until the autumn and to spend the money on clearing the backlog of orders."
+)
+
+
+def random_key(rng, n):
+    while True:
+        key = ''.join(rng.choice(LETTERS) for _ in range(n * n))
+        try:
+            key_schedule(key)
+        except ValueError:
+            continue
+        return key
+
+
+class HillAttackTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.rng = rng
+        self.plaintext = ''.join(rng.choice(LETTERS) for _ in range(4000))
+
+    def encrypt(self, plaintext, key):
+        indices = np.frombuffer(plaintext.encode('ascii'), dtype=np.uint8) - ord('A')
+        return from_indices(encrypt_indices(indices, key))[:len(plaintext)]
+
+    def test_recovers_key(self):
+        for n in range(2, 6):
+            key = random_key(self.rng, n)
+            with self.subTest(key=key):
+                self.assertEqual(attack_hill(self.plaintext, self.encrypt(self.plaintext, key)), key)
+
+    def test_corrupted_crib_is_rejected(self):
+        # 3998 letters leave a 2-letter tail that no 4x4 block covers
+        for length in (4000, 3998):
+            plaintext = self.plaintext[:length]
+            ciphertext = self.encrypt(plaintext, "HILL")
+            for position in (0, 1, length - 1):
+                wrong = 'A' if ciphertext[position] != 'A' else 'B'
+                corrupted = ciphertext[:position] + wrong + ciphertext[position + 1:]
+                with self.subTest(length=length, position=position):
+                    with self.assertRaises(ValueError):
+                        attack_hill(plaintext, corrupted)
+
+    def test_repeated_smaller_key(self):
+        # HILL on the diagonal of a 4x4 key encrypts exactly like HILL
+        key = "HIAALLAAAAHIAALL"
+        ciphertext = self.encrypt(self.plaintext[:3998], key)
+        self.assertEqual(attack_hill(self.plaintext[:3998], ciphertext), "HILL")
+        self.assertEqual(attack_hill(self.plaintext[:3998], ciphertext, key_size=4), key)
+
+
+class HillKeySearchTests(unittest.TestCase):
+    def test_finds_key(self):
+        rng = random.Random(3)
+        for key in ["HILL"] + [random_key(rng, 2) for _ in range(5)]:
+            ciphertext = compile_key('hill', key).encrypt(ENGLISH)
+            with self.subTest(key=key):
+                ranked = search_hill_keys(ciphertext, top_k=3)
+                self.assertEqual(len(ranked), 3)
+                self.assertEqual(ranked[0][0], key)
+                self.assertGreater(ranked[0][1], ranked[1][1])
+
+    def test_full_search_agrees(self):
+        ciphertext = compile_key('hill', "HILL").encrypt(ENGLISH)
+        self.assertEqual(search_hill_keys(ciphertext, top_k=3, method="full"),
+                         search_hill_keys(ciphertext, top_k=3))
+
+    def test_rejects_bad_input(self):
+        for text, method in (("ABC", "columns"), ("ABCDE", "columns"), ("ABCD", "guess")):
+            with self.subTest(text=text, method=method):
+                with self.assertRaises(ValueError):
+                    search_hill_keys(text, method=method)
+
+
+if __name__ == '__main__':
+    unittest.main()
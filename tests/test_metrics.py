@@ -0,0 +1,34 @@
+"""
+Per-stage metrics: no-op while disabled, per-stage totals while enabled.
+"""
+import unittest
+
+from ciphers import metrics
+from ciphers.keys import compile_key
+
+
+class MetricsTests(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(metrics.set_recorder, metrics.set_recorder(None))
+
+    def test_disabled_probe_does_nothing(self):
+        probe = metrics.start('caesar', 'encrypt', 5)
+        self.assertIs(probe, metrics.NULL_PROBE)
+        probe.mark('transform')
+        probe.mark('output', 3)
+        self.assertEqual(compile_key('caesar', 3).encrypt("abc"), "DEF")
+
+    def test_enabled_records_stages(self):
+        from ciphers import hill
+        recorder = metrics.enable_metrics()
+        text = hill.hill_word_mapper("attack at dawn", 'w2n', pad=True)
+        hill.generate_ciphertext(text, "HILL")
+
+        entry = recorder.snapshot()['ciphers']['hill']
+        self.assertEqual(entry['operations'], {'encrypt': {'calls': 1, 'bytes': len(text)}})
+        self.assertEqual(set(entry['stages']), {'normalize', 'key_setup', 'transform', 'output'})
+        self.assertIn('pycipher_stage_seconds_total{cipher="hill",stage="transform"}', recorder.to_prometheus())
+
+
+if __name__ == '__main__':
+    unittest.main()
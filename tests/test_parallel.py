@@ -0,0 +1,64 @@
+"""
+Process-pool driver: sharded results must match a single-process run.
+"""
+import random
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+from ciphers import parallel
+from ciphers.keys import compile_key
+
+KEYS = [
+    ('caesar', 3, {}),
+    ('affine', (5, 8), {}),
+    ('affine', (7, 2), {'include_non_alpha': True}),
+    ('hill', "HILL", {}),
+    ('hill', "GYBNQKURP", {}),
+]
+
+
+class ParallelTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.executor = ProcessPoolExecutor(max_workers=3)
+        rng = random.Random(0)
+        words = ["the", "Quick", "brown", "fox", "jumps", "over", "lazy", "dogs", "x"]
+        cls.text = ' '.join(rng.choice(words) for _ in range(1500)) + '.'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def test_matches_single_process(self):
+        # Small shards so the test text is cut at several block boundaries
+        with mock.patch.object(parallel, 'MIN_SHARD_SIZE', 1000):
+            for cipher, key, options in KEYS:
+                compiled = compile_key(cipher, key)
+                expected = compiled.encrypt(self.text, **options)
+                with self.subTest(cipher=cipher, key=key):
+                    ciphertext = parallel.parallel_encrypt(self.text, cipher, key, workers=3,
+                                                           executor=self.executor, **options)
+                    self.assertEqual(ciphertext, expected)
+                    self.assertEqual(parallel.parallel_decrypt(ciphertext, cipher, key, workers=3,
+                                                               executor=self.executor, **options),
+                                     compiled.decrypt(expected, **options))
+
+    def test_shards_align_to_blocks(self):
+        for size, count, align in ((10, 3, 1), (1000, 3, 4), (1000, 7, 9), (5, 8, 3)):
+            shards = parallel._shards(size, count, align)
+            with self.subTest(size=size, count=count, align=align):
+                self.assertLessEqual(len(shards), count)
+                self.assertEqual(shards[0][0], 0)
+                self.assertEqual(shards[-1][1], size)
+                for (_, stop), (start, _) in zip(shards, shards[1:]):
+                    self.assertEqual(stop, start)
+                    self.assertEqual(start % align, 0)
+
+    def test_rejects_playfair(self):
+        with self.assertRaises(ValueError):
+            parallel.parallel_encrypt("hello", 'playfair', "KEYWORD")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Cipher cascades: fused segments against the stages run one after another.
+"""
+import random
+import unittest
+
+import numpy as np
+
+from ciphers.alphabet import from_indices, to_indices
+from ciphers.keys import compile_key
+from ciphers.pipeline import Pipeline
+
+STAGES = [
+    ('caesar', 3),
+    ('affine', (5, 8)),
+    ('playfair', "KEYWORD"),
+    ('hill', "HILL"),
+    ('hill', "GYBNQKURP"),
+    ('hill', "SPQMSBPHXZMNVFLR"),
+]
+
+# No J, which Playfair folds into I
+LETTERS = "abcdefghiklmnopqrstuvwxyz"
+
+
+def cascades(rng, count, stages=STAGES):
+    for _ in range(count):
+        cascade = rng.choices(stages, k=rng.randint(1, 4))
+        try:
+            pipe = Pipeline(cascade)
+        except ValueError:
+            continue
+        text = ''.join(rng.choice(LETTERS) for _ in range(rng.randint(1, 14)))
+        yield cascade, pipe, text
+
+
+class PipelineTests(unittest.TestCase):
+    def test_matches_stages_in_sequence(self):
+        for cascade, pipe, text in cascades(random.Random(0), 400):
+            indices = to_indices(text.upper())
+            expected = indices
+            for cipher, key in cascade:
+                expected = compile_key(cipher, key).encrypt_indices(expected)
+            with self.subTest(cascade=cascade, text=text):
+                np.testing.assert_array_equal(pipe.encrypt_indices(indices), expected)
+
+    def test_decrypt_inverts_encrypt(self):
+        linear = [stage for stage in STAGES if stage[0] != 'playfair']
+        for cascade, pipe, text in cascades(random.Random(1), 400, linear):
+            with self.subTest(cascade=cascade, text=text):
+                decrypted = pipe.decrypt(pipe.encrypt(text))
+                # Hill padding comes back as whatever earlier stages turn into X
+                self.assertEqual(decrypted[:len(text)], text.upper())
+                self.assertLess(len(decrypted) - len(text), 16)
+
+    def test_hill_blocks_must_divide(self):
+        # After a 4x4 block the length is a multiple of 2, after a 2x2 one not of 3 or 4
+        Pipeline([('hill', "SPQMSBPHXZMNVFLR"), ('caesar', 1), ('hill', "HILL")])
+        for cascade in ([('hill', "HILL"), ('hill', "SPQMSBPHXZMNVFLR")],
+                        [('hill', "HILL"), ('affine', (5, 8)), ('hill', "GYBNQKURP")]):
+            with self.subTest(cascade=cascade):
+                with self.assertRaises(ValueError):
+                    Pipeline(cascade)
+
+
+if __name__ == '__main__':
+    unittest.main()
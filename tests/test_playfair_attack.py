@@ -0,0 +1,34 @@
+"""
+Playfair ciphertext-only attack with the bundled quadgram counts.
+"""
+import unittest
+
+from ciphers import playfair
+from ciphers.playfair_attack import solve_playfair
+
+# The first 200 letters of a plain English paragraph under the key MONARCHY
+KEY = "MONARCHY"
+CIPHERTEXT = (
+    "PDIMARQCTLLAKLIMMTHNRQMLTBNBPRMKXFGUPDFKRQKMELQLKCCLXAXBIFPIMNRLCFANDZCFMATLRSFAAOAPPRKP"
+    "CFZDOIGKYUBXMNZLGAICZLNAILFHDZMKVHDZCLRQFAMGBRHYRAIFHPQPRAXBRYROIUKLGAQYIMDZCFMPCDAKYKIC"
+    "FGNMKLCFGMHRKPCFONRQYVBFHY"
+)
+
+
+class PlayfairAttackTests(unittest.TestCase):
+    def test_solves_known_ciphertext(self):
+        key, plaintext, _ = solve_playfair(CIPHERTEXT, workers=1, seed=1)
+        expected = playfair.decrypt(CIPHERTEXT, KEY, details=False)
+        self.assertTrue(expected.startswith("THEANALYSTSMETEARLYONTUESDAY"))
+        self.assertEqual(plaintext, expected)
+        self.assertEqual(playfair.decrypt(CIPHERTEXT, key, details=False), expected)
+
+    def test_rejects_unusable_ciphertext(self):
+        for text in ("ABCDEF", CIPHERTEXT[:-1]):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    solve_playfair(text, workers=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
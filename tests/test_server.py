@@ -0,0 +1,78 @@
+"""
+Cipher service: pipelined JSON requests over a local socket.
+"""
+import asyncio
+import json
+import unittest
+
+from ciphers.keys import compile_key
+from ciphers.server import CipherServer
+
+
+class CipherServerTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # inline_limit=8 sends the longer texts through the process pool
+        self.service = CipherServer(workers=1, inline_limit=8)
+        self.server = await self.service.start(port=0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.reader, self.writer = await asyncio.open_connection('127.0.0.1', port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        self.server.close()
+        await self.server.wait_closed()
+        self.service.close()
+
+    async def exchange(self, *lines):
+        """
+        Pipeline every line on the connection, then read one response each.
+        """
+        for line in lines:
+            data = line if isinstance(line, bytes) else json.dumps(line).encode('utf-8')
+            self.writer.write(data + b'\n')
+        await self.writer.drain()
+        return [json.loads(await self.reader.readline()) for _ in lines]
+
+    async def test_transforms(self):
+        requests = [
+            {'id': 1, 'op': 'encrypt', 'cipher': 'affine', 'key': [5, 8], 'text': "attack at dawn"},
+            {'id': 2, 'op': 'encrypt', 'cipher': 'caesar', 'key': 3, 'text': "abc"},
+            {'id': 3, 'op': 'encrypt', 'cipher': 'hill', 'key': "GYBNQKURP", 'text': "the quick brown fox"},
+            {'id': 4, 'op': 'decrypt', 'cipher': 'playfair', 'key': "MONARCHY", 'text': "RSSRDE"},
+        ]
+        responses = await self.exchange(*requests)
+        for request, response in zip(requests, responses):
+            compiled = compile_key(request['cipher'], request['key'])
+            transform = compiled.decrypt if request['op'] == 'decrypt' else compiled.encrypt
+            with self.subTest(request=request):
+                self.assertEqual(response, {'id': request['id'], 'ok': True, 'result': transform(request['text'])})
+        self.assertEqual(responses[0]['result'], "izzisgizxiov")
+
+    async def test_errors_keep_the_connection(self):
+        responses = await self.exchange(
+            b'{not json',
+            {'id': 1, 'op': 'shred'},
+            {'id': 2, 'op': 'encrypt', 'cipher': 'affine', 'key': [2, 8], 'text': "abc"},
+            {'id': 3, 'op': 'encrypt', 'cipher': 'caesar', 'key': 3, 'text': "abc", 'shout': True},
+            {'id': 4, 'op': 'encrypt', 'cipher': 'affine', 'key': [5, 8], 'text': "abc",
+             'include_non_alpha': 1},
+            {'id': 5, 'op': 'encrypt', 'cipher': 'caesar', 'key': 3, 'text': "abc"},
+        )
+        self.assertEqual([r['id'] for r in responses], [None, 1, 2, 3, 4, 5])
+        self.assertEqual([r['ok'] for r in responses], [False] * 5 + [True])
+        self.assertEqual(responses[-1]['result'], "DEF")
+
+    async def test_attack_and_stats(self):
+        ciphertext = compile_key('hill', "HILL").encrypt("short example")
+        attack, stats = await self.exchange(
+            {'id': 1, 'op': 'attack', 'cipher': 'hill', 'text': ciphertext, 'known_plaintext': "shortexample"},
+            {'id': 2, 'op': 'stats'},
+        )
+        self.assertEqual(attack['result'], "HILL")
+        self.assertEqual(stats['result']['requests'], 1)
+        self.assertEqual(stats['result']['latency']['attack']['count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Streaming encrypt/decrypt: state carried across chunks must give the
+same output as a single call.
+
+    python -m unittest discover tests
+"""
+import io
+import unittest
+
+from ciphers.keys import compile_key
+from ciphers.stream import decrypt_stream, encrypt_stream
+
+# Double letters, X and J, odd lengths and characters each cipher drops
+TEXTS = [
+    "a",
+    "xx",
+    "balloon",
+    "Hello, world!",
+    "committee meeting at noon",
+    "the jazz quizzes puzzle all of us",
+    "Attack at dawn; XXX marks the spot -- bees.",
+]
+
+STREAM_KEYS = [
+    ('caesar', 3, {}),
+    ('affine', (5, 8), {}),
+    ('affine', (7, 2), {'include_non_alpha': True}),
+    ('playfair', "PLAYFAIR EXAMPLE", {}),
+    ('hill', "HILL", {}),
+    ('hill', "GYBNQKURP", {}),
+]
+
+
+def run_stream(run, text, cipher, key, chunk_size, options):
+    writer = io.StringIO()
+    run(io.StringIO(text), writer, cipher, key, chunk_size, **options)
+    return writer.getvalue()
+
+
+class StreamChunkTests(unittest.TestCase):
+    def test_encrypt_matches_single_shot(self):
+        for cipher, key, options in STREAM_KEYS:
+            compiled = compile_key(cipher, key)
+            for text in TEXTS:
+                expected = compiled.encrypt(text, **options)
+                for chunk_size in range(1, 8):
+                    with self.subTest(cipher=cipher, key=key, text=text, chunk_size=chunk_size):
+                        self.assertEqual(run_stream(encrypt_stream, text, cipher, key, chunk_size, options), expected)
+
+    def test_decrypt_matches_single_shot(self):
+        for cipher, key, options in STREAM_KEYS:
+            compiled = compile_key(cipher, key)
+            for text in TEXTS:
+                ciphertext = compiled.encrypt(text, **options)
+                expected = compiled.decrypt(ciphertext, **options)
+                for chunk_size in range(1, 8):
+                    with self.subTest(cipher=cipher, key=key, text=text, chunk_size=chunk_size):
+                        self.assertEqual(run_stream(decrypt_stream, ciphertext, cipher, key, chunk_size, options),
+                                         expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
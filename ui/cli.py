@@ -0,0 +1,183 @@
+"""
+Non-interactive command line interface.
+
+    python main.py encrypt --cipher hill --key HILL -i in.txt -o out.txt
+    cat in.txt | python main.py encrypt --cipher affine --key 5,8 > out.txt
+    python main.py decrypt --cipher caesar --key 3 -i 'logs/*.txt' -o decrypted/ --jobs 4
+
+Inputs may be files, glob patterns or directories (walked recursively); '-'
+or no -i at all reads stdin. With a single input, -o names the output file
+('-' or omitted for stdout). With several inputs, -o is a directory and
+each result keeps its path relative to the input it came from (for a glob,
+to the part of the pattern before the first wildcard); two inputs that
+would be written to the same output are an error, as is an output that is
+one of the inputs or a directory inside an input directory. Input line
+endings are read as LF.
+
+Data is streamed through ciphers.stream in large chunks, so file size does
+not affect memory use. The key is validated and compiled once before any
+input is read; with --jobs N files are processed by N worker processes,
+each compiling the key once for its whole share of the batch.
+"""
+import argparse
+import glob
+import os
+import sys
+
+from ciphers.keys import CIPHERS, compile_key, parse_key
+from ciphers.stream import DEFAULT_CHUNK_SIZE, decrypt_stream, encrypt_stream
+
+
+def glob_root(pattern):
+    """
+    The leading directories of a glob pattern that contain no wildcards.
+    """
+    parts = []
+    for part in os.path.dirname(pattern).split(os.sep):
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return os.sep.join(parts) or os.curdir
+
+
+def expand_inputs(patterns):
+    """
+    Resolve files, globs and directories to (path, output name) pairs.
+    Files keep their base name, directory and glob matches their path
+    below the directory or the fixed part of the pattern.
+    """
+    found = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    found.append((path, os.path.relpath(path, pattern)))
+        elif os.path.isfile(pattern):
+            found.append((pattern, os.path.basename(pattern)))
+        else:
+            matches = sorted(p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p))
+            if not matches:
+                raise ValueError(f"No input files match {pattern!r}.")
+            root = glob_root(pattern)
+            found.extend((path, os.path.relpath(path, root)) for path in matches)
+    return found
+
+
+def process(mode, cipher, key, src, dst, chunk_size, options):
+    """
+    Stream one input into one output. '-' means stdin/stdout.
+    """
+    run = decrypt_stream if mode == 'decrypt' else encrypt_stream
+    if src == '-':
+        # Read CRLF as LF, as for files opened by name
+        sys.stdin.reconfigure(newline=None)
+        reader = sys.stdin
+    else:
+        reader = open(src, 'r', encoding='utf-8')
+    try:
+        if dst == '-':
+            written = run(reader, sys.stdout, cipher, key, chunk_size, **options)
+            sys.stdout.flush()
+            return written
+
+        directory = os.path.dirname(dst)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            with open(dst, 'w', encoding='utf-8', newline='') as writer:
+                return run(reader, writer, cipher, key, chunk_size, **options)
+        except BaseException:
+            # Leave no partial output behind
+            os.remove(dst)
+            raise
+    except KeyError as e:
+        name = 'stdin' if src == '-' else src
+        raise ValueError(f"{name}: unsupported character {e.args[0]!r} for {cipher}.") from None
+    finally:
+        if reader is not sys.stdin:
+            reader.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="pycipher", description="Encrypt or decrypt files and pipes.")
+    parser.add_argument("mode", choices=["encrypt", "decrypt"])
+    parser.add_argument("--cipher", "-c", required=True, choices=CIPHERS)
+    parser.add_argument("--key", "-k", required=True, help="Shift, 'a,b' or key string")
+    parser.add_argument("--input", "-i", nargs="+", default=["-"],
+                        help="Files, globs or directories ('-' for stdin, the default)")
+    parser.add_argument("--output", "-o", default="-",
+                        help="Output file, or directory for several inputs ('-' for stdout, the default)")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Files processed concurrently (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Characters read per chunk (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--include-non-alpha", action="store_true",
+                        help="Affine: keep characters outside A-Z instead of dropping them")
+    return parser
+
+
+def check_output(src, dst):
+    """
+    Refuse to write over an input: the output is opened before the input
+    is read, which would truncate it.
+    """
+    if dst != '-' and os.path.realpath(src) == os.path.realpath(dst):
+        raise ValueError(f"{dst} is also an input; choose a different output.")
+
+
+def plan(args):
+    """
+    Return the list of (src, dst) pairs for a parsed command line.
+    """
+    if args.input == ['-']:
+        return [('-', args.output)]
+
+    inputs = expand_inputs(args.input)
+    if len(inputs) == 1 and not os.path.isdir(args.output):
+        check_output(inputs[0][0], args.output)
+        return [(inputs[0][0], args.output)]
+
+    if args.output == '-':
+        raise ValueError("Several inputs need an output directory (-o DIR).")
+    output = os.path.realpath(args.output)
+    for pattern in args.input:
+        if os.path.isdir(pattern):
+            root = os.path.realpath(pattern)
+            if output == root or output.startswith(root + os.sep):
+                raise ValueError(f"The output directory {args.output} is inside the input directory {pattern}.")
+
+    jobs = []
+    sources = {}
+    for src, name in inputs:
+        dst = os.path.join(args.output, name)
+        if dst in sources:
+            raise ValueError(f"{sources[dst]} and {src} would both be written to {dst}.")
+        check_output(src, dst)
+        sources[dst] = src
+        jobs.append((src, dst))
+    return jobs
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    options = {'include_non_alpha': True} if args.include_non_alpha and args.cipher == 'affine' else {}
+
+    try:
+        key = parse_key(args.cipher, args.key)
+        compile_key(args.cipher, key)
+        jobs = plan(args)
+
+        if args.jobs > 1 and len(jobs) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=min(args.jobs, len(jobs))) as pool:
+                futures = [pool.submit(process, args.mode, args.cipher, key, src, dst, args.chunk_size, options)
+                           for src, dst in jobs]
+                for future in futures:
+                    future.result()
+        else:
+            for src, dst in jobs:
+                process(args.mode, args.cipher, key, src, dst, args.chunk_size, options)
+    except (ValueError, OSError) as e:
+        print(f"pycipher: error: {e}", file=sys.stderr)
+        return 1
+    return 0